@@ -0,0 +1,194 @@
+"""페이지별 계산·렌더 경로 벤치마크 (Streamlit AppTest 기반, 오프라인 실행).
+
+main.py 와 9개 페이지를 대표적인 위젯 상태(넓은 연도 범위, 다수 국가 선택, 기준값 스윕 등)로
+헤드리스 실행하면서 시나리오별 실행 시간, 같은 상태로 다시 실행한 시간(공유 그림 캐시 적중),
+최대 메모리(tracemalloc), 직렬화된 그림 크기를 측정해 JSON 으로 저장합니다.
+
+사용법 (저장소 루트에서)::
+
+    python -m benchmarks.bench_pages                          # 결과를 benchmarks/results.json 에 저장
+    python -m benchmarks.bench_pages --save-baseline          # 결과를 기준선으로 저장
+    python -m benchmarks.bench_pages --compare benchmarks/baseline.json --tolerance 0.25
+    python -m benchmarks.bench_pages --cold -k 05 -k 09       # 시나리오마다 캐시 비우고, 일부만 실행
+
+--compare 모드에서는 기준선보다 (1 + tolerance) 배 이상 나빠진 항목을 회귀로 표시하고
+종료 코드 1 을 반환합니다.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_OUTPUT = ROOT / "benchmarks" / "results.json"
+DEFAULT_BASELINE = ROOT / "benchmarks" / "baseline.json"
+METRICS = ("wall_s", "rerun_s", "peak_mem_mb", "figure_bytes")
+
+# (시나리오 이름, 페이지 파일 접두어, [(위젯 종류, 순번, 값), ...])
+SCENARIOS = [
+    ("main", "main.py", []),
+    ("01_default", "pages/01_", []),
+    ("01_wide_region_weighted", "pages/01_", [("slider", 0, (1800, 2100)), ("radio", 0, "권역별"), ("toggle", 0, True)]),
+    ("02_default", "pages/02_", []),
+    ("02_threshold_sweep", "pages/02_", [("number_input", 0, t) for t in (250, 1000, 5000, 20000)]),
+    ("03_default", "pages/03_", []),
+    ("03_wide_cagr", "pages/03_", [("select_slider", 0, (1800, 2100)), ("radio", 0, "연평균 성장률(CAGR, %)")]),
+    ("04_default", "pages/04_", []),
+    ("04_many_years", "pages/04_", [("multiselect", 0, list(range(1800, 2101, 5)))]),
+    ("04_many_years_kde", "pages/04_", [("multiselect", 0, list(range(1800, 2101, 5))), ("radio", 0, "밀도(KDE)")]),
+    ("05_default", "pages/05_", []),
+    ("05_full_stride", "pages/05_", [("select_slider", 0, 1), ("radio", 0, "최소제곱(OLS)")]),
+    ("06_default", "pages/06_", []),
+    ("06_recent", "pages/06_", [("select_slider", 0, (1950, 2020))]),
+    ("07_default", "pages/07_", []),
+    ("08_default", "pages/08_", []),
+    ("08_threshold_sweep", "pages/08_", [("number_input", 0, t) for t in (250, 1000, 5000, 20000)]),
+    ("09_default", "pages/09_", []),
+    ("09_many_countries", "pages/09_", [("multiselect", 0, "first:60"), ("slider", 0, (1800, 2100))]),
+]
+
+
+def _script(prefix):
+    if prefix.endswith(".py"):
+        return ROOT / prefix
+    return next(ROOT.glob(f"{prefix}*.py"))
+
+
+def _apply(at, kind, index, value):
+    widget = getattr(at, kind)[index]
+    if isinstance(value, str) and value.startswith("first:"):
+        value = list(widget.options[: int(value.split(":")[1])])
+    widget.set_value(value).run()
+
+
+def _run_once(script, actions, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(script), default_timeout=timeout).run()
+    for kind, index, value in actions:
+        _apply(at, kind, index, value)
+    if at.exception:
+        raise RuntimeError(f"{script.name}: {at.exception[0].value}")
+    charts = at.get("plotly_chart")
+    return at, len(charts), sum(len(c.proto.spec) for c in charts)
+
+
+def _clear_caches():
+    import streamlit as st
+
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+def run_scenario(name, prefix, actions, repeat=3, cold=False, timeout=120):
+    script = _script(prefix)
+    times, reruns = [], []
+    for _ in range(repeat):
+        if cold:
+            _clear_caches()
+        start = time.perf_counter()
+        at, n_charts, figure_bytes = _run_once(script, actions, timeout)
+        times.append(time.perf_counter() - start)
+        # 위젯 상태를 그대로 두고 다시 실행 (다른 세션이 같은 화면을 연 경우와 같은 캐시 적중 경로)
+        start = time.perf_counter()
+        at.run()
+        reruns.append(time.perf_counter() - start)
+
+    # 메모리는 시간 측정과 분리해 한 번 더 실행 (tracemalloc 오버헤드 제외)
+    if cold:
+        _clear_caches()
+    tracemalloc.start()
+    try:
+        _run_once(script, actions, timeout)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "page": script.name,
+        "actions": len(actions),
+        "wall_s": round(statistics.median(times), 4),
+        "wall_min_s": round(min(times), 4),
+        "rerun_s": round(statistics.median(reruns), 4),
+        "peak_mem_mb": round(peak / 1024 / 1024, 3),
+        "figure_bytes": figure_bytes,
+        "charts": n_charts,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """기준선 대비 (1 + tolerance) 배를 넘는 항목 목록."""
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric in METRICS:
+            old, new = base.get(metric), current.get(metric)
+            if old and new is not None and new > old * (1 + tolerance):
+                regressions.append((name, metric, old, new))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gapminder 대시보드 페이지 벤치마크")
+    parser.add_argument("-o", "--output", type=Path, default=DEFAULT_OUTPUT, help="결과 JSON 경로")
+    parser.add_argument("-k", "--select", action="append", default=[], help="이름에 이 문자열이 포함된 시나리오만 실행 (반복 가능)")
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="시나리오별 반복 횟수 (중앙값 기록)")
+    parser.add_argument("--cold", action="store_true", help="매 실행 전에 st.cache_* 를 비움")
+    parser.add_argument("--compare", type=Path, help="비교할 기준선 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="회귀 판정 허용 비율 (기본 0.25)")
+    parser.add_argument("--save-baseline", action="store_true", help=f"결과를 {DEFAULT_BASELINE.name} 로도 저장")
+    args = parser.parse_args(argv)
+
+    # 결과가 기준선 파일을 덮어쓰기 전에 먼저 읽어 둠
+    baseline = json.loads(args.compare.read_text())["results"] if args.compare else None
+
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT))
+    # 백그라운드 워밍업은 측정을 흐리므로 끔
+    os.environ.setdefault("GAPMINDER_WARMUP", "0")
+
+    results = {}
+    for name, prefix, actions in SCENARIOS:
+        if args.select and not any(s in name for s in args.select):
+            continue
+        results[name] = run_scenario(name, prefix, actions, repeat=args.repeat, cold=args.cold)
+        r = results[name]
+        print(f"{name:28s} {r['wall_s']:8.3f}s {r['rerun_s']:8.3f}s {r['peak_mem_mb']:9.2f}MB {r['figure_bytes']:>10,}B")
+
+    import streamlit
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "streamlit": streamlit.__version__,
+            "repeat": args.repeat,
+            "cold": args.cold,
+        },
+        "results": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.save_baseline:
+        DEFAULT_BASELINE.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        for name, metric, old, new in regressions:
+            print(f"REGRESSION {name}.{metric}: {old} → {new} (+{(new / old - 1) * 100:.0f}%)")
+        if regressions:
+            return 1
+        print(f"회귀 없음 (허용 비율 {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""페이지들이 공유하는 데이터 로드·계산 모듈 모음."""
@@ -0,0 +1,372 @@
+"""대시보드 집계를 노트북·채점 스크립트에 제공하는 로컬 읽기 전용 HTTP API.
+
+Streamlit 앱과 같은 계산 모듈(``common.ranges``, ``common.backend``)을 그대로 사용하므로
+페이지와 같은 숫자를 돌려줍니다. 표준 라이브러리 ``http.server`` 만 사용합니다.
+
+    python -m common.api                      # http://127.0.0.1:8765
+    python -m common.api --port 9000
+
+엔드포인트:
+
+- ``GET /v1/queries`` — 질의 목록과 매개변수 기본값
+- ``GET /v1/query/<이름>?매개변수=값`` — 결과 표. 기본은 JSON,
+  ``?format=arrow`` 또는 ``Accept: application/vnd.apache.arrow.stream`` 이면 Arrow IPC 스트림
+- ``POST /v1/batch`` — ``{"queries": [{"query": 이름, "params": {...}}, ...]}`` 를 한 번에 (JSON)
+- ``GET /v1/stats`` — 결과 캐시 통계
+
+매개변수는 질의마다 허용된 값(지표·집계 수준·변화량 종류, 데이터에 있는 연도 범위, 유한한 숫자,
+``true``/``false``/``1``/``0`` 불리언)만 받으며, 벗어나면 400, 계산 중 예상하지 못한 오류는
+500 JSON 오류로 응답합니다.
+
+응답에는 데이터 버전·질의·매개변수·형식으로 만든 ``ETag`` 가 붙고, ``If-None-Match`` 가 같으면
+계산 없이 304 를 돌려줍니다. 직렬화된 결과는 프로세스 안의 스레드 안전 LRU
+(``GAPMINDER_API_CACHE_MB``, 기본 32MB)에 보관하며, 같은 질의가 동시에 들어오면 한 번만 계산합니다.
+"""
+import argparse
+import hashlib
+import io
+import json
+import logging
+import math
+import os
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from common import shared
+from common.backend import get_backend
+from common.data import METRIC_COLS, load_data
+from common.figcache import PayloadCache, normalize_state
+from common.ranges import LEVELS, METRICS as RANGE_METRICS, load_range_aggregates
+from common.ranking import KINDS
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow 미설치 시 JSON 응답만 제공
+    pa = None
+
+logger = logging.getLogger("gapminder.api")
+
+API_VERSION = 1
+DEFAULT_BUDGET_MB = 32
+JSON_TYPE = "application/json; charset=utf-8"
+ARROW_TYPE = "application/vnd.apache.arrow.stream"
+
+
+def _bool(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value).lower()
+    if text not in ("1", "0", "true", "false"):
+        raise ValueError(value)
+    return text in ("1", "true")
+
+
+def _finite_float(value):
+    # float() 는 'nan'·'inf' 도 받아들이므로 유한한 값만 통과시킴
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError(value)
+    return value
+
+
+def _optional_int(value):
+    return None if value in (None, "") else int(value)
+
+
+def _positive_int(value):
+    value = int(value)
+    if value <= 0:
+        raise ValueError(value)
+    return value
+
+
+def _choice(allowed):
+    """허용 목록 안의 문자열만 통과시키는 변환 함수 (컬럼 이름 등)."""
+    def convert(value):
+        if value not in allowed:
+            raise ValueError(value)
+        return value
+    return convert
+
+
+# 페이지 01: 연도별 평균·구간 평균
+def yearly_mean(metric, level, weighted, start, end):
+    frame = load_range_aggregates().yearly_mean(metric, level=level, weighted=weighted, start=start, end=end)
+    return frame.melt(ignore_index=False, var_name="group", value_name=metric).reset_index()
+
+
+def window_mean(metric, level, weighted, start, end):
+    means = load_range_aggregates().window_mean(metric, start, end, level=level, weighted=weighted)
+    return means.rename_axis("group").reset_index()
+
+
+# 페이지 02: 저소득 국가 비율
+def low_income_share(threshold, start, end):
+    return get_backend().share_by_year(threshold, start=start, end=end)
+
+
+# 페이지 03: 성장 상위/하위 k
+def growth_top(metric, y1, y2, kind, k):
+    top, bottom = get_backend().rankings(metric, y1, y2, kinds=(kind,), k=k)[kind]
+    return pd.concat([
+        top.assign(side="top", rank=range(1, len(top) + 1)),
+        bottom.assign(side="bottom", rank=range(1, len(bottom) + 1)),
+    ], ignore_index=True)[["side", "rank", "country", kind]]
+
+
+# 페이지 07: 소득그룹별 추세
+def income_trend(metric, start, end):
+    return get_backend().group_mean(metric, "income_groups", start=start, end=end)
+
+
+def income_bands(start, end):
+    return get_backend().income_trends(start=start, end=end)
+
+
+# 질의 이름 → (함수, {매개변수: (변환 함수, 기본값)}). 변환 함수가 ValueError 를 내면 400 입니다.
+QUERIES = {
+    "yearly_mean": (yearly_mean, {
+        "metric": (_choice(RANGE_METRICS), "lex"), "level": (_choice(LEVELS), "world"), "weighted": (_bool, False),
+        "start": (_optional_int, None), "end": (_optional_int, None),
+    }),
+    "window_mean": (window_mean, {
+        "metric": (_choice(RANGE_METRICS), "lex"), "level": (_choice(LEVELS), "world"), "weighted": (_bool, False),
+        "start": (int, 2000), "end": (int, 2020),
+    }),
+    "low_income_share": (low_income_share, {
+        "threshold": (_finite_float, 1000.0), "start": (_optional_int, None), "end": (_optional_int, None),
+    }),
+    "growth_top": (growth_top, {
+        "metric": (_choice(METRIC_COLS), "gdp_pcap"), "y1": (int, 2000), "y2": (int, 2020),
+        "kind": (_choice(KINDS), "pct_change"), "k": (_positive_int, 10),
+    }),
+    "income_trend": (income_trend, {
+        "metric": (_choice(METRIC_COLS), "gdp_pcap"), "start": (_optional_int, None), "end": (_optional_int, None),
+    }),
+    "income_bands": (income_bands, {
+        "start": (_optional_int, None), "end": (_optional_int, None),
+    }),
+}
+
+
+class QueryError(ValueError):
+    """잘못된 질의 (HTTP 상태 코드 포함)."""
+
+    def __init__(self, message, status=HTTPStatus.BAD_REQUEST):
+        super().__init__(message)
+        self.status = status
+
+
+def _to_json(name, params, frame):
+    rows = frame.to_json(orient="records", force_ascii=False)
+    head = json.dumps({"query": name, "params": params}, ensure_ascii=False, allow_nan=False)[:-1]
+    return f'{head}, "rows": {rows}}}'.encode()
+
+
+def _to_arrow(frame):
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+class QueryService:
+    """HTTP 와 무관한 질의 실행기 (매개변수 검증, ETag, 결과 캐시)."""
+
+    def __init__(self, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get("GAPMINDER_API_CACHE_MB", DEFAULT_BUDGET_MB)) * 1024 * 1024)
+        self.cache = PayloadCache(max_bytes)
+        backend = get_backend()
+        if backend.name == "pandas":
+            load_data()  # 데이터 캐시를 최신으로 만든 뒤 버전을 읽음 (duckdb 는 Parquet 를 직접 질의)
+        self.data_version = f"{API_VERSION}:{shared.bundle_token()}"
+        years = backend.years()
+        self.year_range = (int(years[0]), int(years[-1]))
+
+    def catalog(self):
+        return {name: {p: default for p, (_, default) in spec.items()} for name, (_, spec) in QUERIES.items()}
+
+    def parse(self, name, raw):
+        if name not in QUERIES:
+            raise QueryError(f"알 수 없는 질의: {name!r}", HTTPStatus.NOT_FOUND)
+        _, spec = QUERIES[name]
+        if not isinstance(raw, dict):
+            raise QueryError(f"{name}: params 는 객체여야 합니다.")
+        unknown = set(raw) - set(spec)
+        if unknown:
+            raise QueryError(f"{name}: 알 수 없는 매개변수 {sorted(unknown)}")
+        params = {}
+        for param, (convert, default) in spec.items():
+            try:
+                params[param] = convert(raw[param]) if param in raw else default
+            except (TypeError, ValueError):
+                raise QueryError(f"{name}: {param} 값이 올바르지 않습니다: {raw[param]!r}")
+        self._check_years(name, params)
+        return params
+
+    def _check_years(self, name, params):
+        lo, hi = self.year_range
+        for param in ("start", "end", "y1", "y2"):
+            year = params.get(param)
+            if year is not None and not lo <= year <= hi:
+                raise QueryError(f"{name}: {param} 는 {lo}~{hi} 사이여야 합니다: {year}")
+        for a, b in (("start", "end"), ("y1", "y2")):
+            if params.get(a) is not None and params.get(b) is not None and params[a] > params[b]:
+                raise QueryError(f"{name}: {a} 가 {b} 보다 큽니다.")
+
+    def etag(self, name, params, fmt):
+        key = f"{self.data_version}|{name}|{normalize_state(params)}|{fmt}"
+        return '"' + hashlib.sha256(key.encode()).hexdigest()[:24] + '"'
+
+    def run(self, name, raw, fmt="json"):
+        """(ETag, 본문 bytes). 결과는 캐시에서 가져오거나 계산해 저장합니다."""
+        if fmt == "arrow" and pa is None:
+            raise QueryError("pyarrow 가 없어 Arrow 응답을 만들 수 없습니다.", HTTPStatus.NOT_ACCEPTABLE)
+        params = self.parse(name, raw)
+        etag = self.etag(name, params, fmt)
+
+        def make():
+            func, _ = QUERIES[name]
+            try:
+                frame = func(**params)
+            except KeyError as e:
+                raise QueryError(f"{name}: 알 수 없는 값 {e}")
+            except ValueError as e:
+                raise QueryError(f"{name}: {e}")
+            except Exception:
+                logger.exception("query %s failed: %s", name, params)
+                raise QueryError(f"{name}: 내부 오류", HTTPStatus.INTERNAL_SERVER_ERROR)
+            return _to_arrow(frame) if fmt == "arrow" else _to_json(name, params, frame)
+
+        return etag, self.cache.get(etag, make)
+
+    def batch(self, items):
+        """여러 질의를 한 번에 실행 → (ETag, JSON 본문). 실패한 질의는 error 항목으로 돌려줍니다."""
+        if not isinstance(items, list):
+            raise QueryError('본문은 {"queries": [...]} 형식이어야 합니다.')
+        etags, bodies = [], []
+        for item in items:
+            name = item.get("query") if isinstance(item, dict) else None
+            try:
+                if not isinstance(item, dict):
+                    raise QueryError("질의 항목은 객체여야 합니다.")
+                etag, body = self.run(name, item.get("params") or {})
+            except QueryError as e:
+                body = json.dumps({"query": name, "error": str(e)}, ensure_ascii=False).encode()
+                etag = hashlib.sha256(body).hexdigest()
+            etags.append(etag)
+            bodies.append(body)
+        etag = '"' + hashlib.sha256("|".join(etags).encode()).hexdigest()[:24] + '"'
+        return etag, b'{"results": [' + b", ".join(bodies) + b"]}"
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = f"GapminderAPI/{API_VERSION}"
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def _send(self, status, body=b"", content_type=JSON_TYPE, etag=None):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.wfile.write(body)
+
+    def _send_json(self, obj, status=HTTPStatus.OK):
+        self._send(status, json.dumps(obj, ensure_ascii=False, allow_nan=False, default=str).encode())
+
+    def _not_modified(self, etag):
+        match = self.headers.get("If-None-Match", "")
+        return match.strip() == "*" or etag in (m.strip() for m in match.split(","))
+
+    def _reply(self, etag, body, content_type):
+        if self._not_modified(etag):
+            self._send(HTTPStatus.NOT_MODIFIED, etag=etag)
+        else:
+            self._send(HTTPStatus.OK, body, content_type, etag=etag)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            if url.path in ("/", "/v1/queries"):
+                return self._send_json(self.service.catalog())
+            if url.path == "/v1/stats":
+                return self._send_json({"data_version": self.service.data_version, **self.service.cache.stats()})
+            if url.path.startswith("/v1/query/"):
+                raw = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                fmt = raw.pop("format", None)
+                if fmt is None:
+                    fmt = "arrow" if ARROW_TYPE in self.headers.get("Accept", "") else "json"
+                if fmt not in ("json", "arrow"):
+                    raise QueryError(f"알 수 없는 형식: {fmt!r}")
+                etag, body = self.service.run(url.path[len("/v1/query/"):], raw, fmt)
+                return self._reply(etag, body, ARROW_TYPE if fmt == "arrow" else JSON_TYPE)
+            raise QueryError(f"없는 경로: {url.path}", HTTPStatus.NOT_FOUND)
+        except QueryError as e:
+            self._send_json({"error": str(e)}, e.status)
+        except Exception:
+            # 처리되지 않은 예외로 응답 없이 연결이 끊기지 않도록 500 으로 응답
+            logger.exception("GET %s failed", self.path)
+            self._send_json({"error": "내부 오류"}, HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    def do_POST(self):
+        try:
+            if urlsplit(self.path).path != "/v1/batch":
+                raise QueryError(f"없는 경로: {self.path}", HTTPStatus.NOT_FOUND)
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except json.JSONDecodeError as e:
+                raise QueryError(f"JSON 본문을 읽을 수 없습니다: {e}")
+            etag, body = self.service.batch(payload.get("queries") if isinstance(payload, dict) else None)
+            self._reply(etag, body, JSON_TYPE)
+        except QueryError as e:
+            self._send_json({"error": str(e)}, e.status)
+        except Exception:
+            logger.exception("POST %s failed", self.path)
+            self._send_json({"error": "내부 오류"}, HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(host="127.0.0.1", port=8765, service=None, quiet=False):
+    """요청마다 스레드를 쓰는 서버를 만듭니다. port=0 이면 빈 포트를 고릅니다."""
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    server.daemon_threads = True
+    server.service = service or QueryService()
+    server.quiet = quiet
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gapminder 집계 로컬 읽기 전용 API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--quiet", action="store_true", help="요청 로그를 남기지 않음")
+    args = parser.parse_args(argv)
+    server = make_server(args.host, args.port, quiet=args.quiet)
+    print(f"http://{args.host}:{server.server_port}/v1/queries")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""페이지 집계용 질의 백엔드 (pandas 기본, DuckDB + Parquet 선택).
+
+페이지 02, 03, 07, 08 은 데이터 프레임을 직접 다루지 않고 ``get_backend()`` 가 돌려주는
+백엔드의 질의 메서드를 호출합니다. 두 백엔드는 같은 메서드와 같은 결과 형식을 가집니다.
+
+- ``PandasBackend`` (기본): 프로세스 메모리에 올린 데이터와 미리 만든 인덱스
+  (``common.thresholds``, ``common.ranking``) 를 사용합니다. 현재 데이터 크기에 적합합니다.
+- ``DuckDBBackend``: 권역(``world_4region``) 별로 파티션하고 연도순으로 정렬해 쓴 Parquet
+  데이터셋을 DuckDB 로 직접 질의합니다. 필터·그룹·피벗이 엔진 안에서 실행되고, 필요한
+  컬럼만(projection), 필요한 연도 row group·권역 파티션만(predicate) 읽으므로 데이터가
+  메모리보다 커도 동작합니다.
+
+환경 변수 ``GAPMINDER_BACKEND=duckdb`` 로 선택하며, duckdb 가 없거나 데이터셋이 없으면
+경고를 남기고 pandas 로 돌아갑니다. 데이터셋 위치는 ``GAPMINDER_PARQUET_DIR`` 로 바꿀 수
+있습니다. 현재 CSV 에서 데이터셋을 만들려면::
+
+    python -m common.backend export          # data/parquet/merged_gapminder/
+    python -m common.backend export --force  # 기존 데이터셋을 지우고 다시 작성
+"""
+import argparse
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+
+from common.data import DATA_DIR, MERGED_CSV, METRIC_COLS, load_data
+from common.quantiles import load_box_summaries
+from common.ranking import KINDS, load_growth_engine
+from common.thresholds import load_gdp_thresholds
+
+try:
+    import duckdb
+except ImportError:  # duckdb 미설치 시 pandas 백엔드만 사용
+    duckdb = None
+
+logger = logging.getLogger("gapminder.backend")
+
+PARQUET_DIR = Path(os.environ.get("GAPMINDER_PARQUET_DIR", DATA_DIR / "parquet" / "merged_gapminder"))
+PARTITION_COL = "world_4region"
+ROW_GROUP_SIZE = 122_880
+GROUP_COLS = ("world_4region", "income_groups")
+
+
+def _literal(value):
+    """SQL 문자열 리터럴 (DDL·COPY 문은 매개변수 바인딩을 지원하지 않음)."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _column(name, allowed):
+    """질의에 들어갈 컬럼 이름을 알려진 컬럼 목록으로 확인합니다 (SQL 식별자 주입 방지)."""
+    if name not in allowed:
+        raise ValueError(f"unknown column: {name!r}")
+    return name
+
+
+def _year_range(frame, start, end):
+    if start is not None:
+        frame = frame[frame["year"] >= start]
+    if end is not None:
+        frame = frame[frame["year"] <= end]
+    return frame.reset_index(drop=True)
+
+
+class PandasBackend:
+    """메모리 내 인덱스를 쓰는 기본 백엔드."""
+
+    name = "pandas"
+
+    def years(self):
+        return load_gdp_thresholds().years
+
+    def share_by_year(self, threshold, start=None, end=None):
+        """연도별 1인당 GDP 기준값 미만 국가 비율(%) → DataFrame[year, pct]"""
+        return _year_range(load_gdp_thresholds().share_by_year(threshold), start, end)
+
+    def share_curve(self, thresholds):
+        """여러 기준값에 대한 (연도 배열, (연도 수, 기준값 수) 비율 행렬)."""
+        index = load_gdp_thresholds()
+        return index.years, index.share_curve(thresholds)
+
+    def count_by_region(self, threshold, start=None, end=None):
+        """연도 × 권역별 기준값 미만 국가 수 → DataFrame[year, world_4region, count]"""
+        return _year_range(load_gdp_thresholds().count_by_region(threshold), start, end)
+
+    def rankings(self, metric, y1, y2, kinds=KINDS, k=10):
+        """kind 별 (상위 k, 하위 k) DataFrame[country, <kind>] 쌍을 담은 dict."""
+        return load_growth_engine().rankings(metric, y1, y2, kinds=kinds, k=k)
+
+    def group_mean(self, metric, by, start=None, end=None):
+        """(연도, by) 별 평균 → DataFrame[year, by, metric]"""
+        metric, by = _column(metric, METRIC_COLS), _column(by, GROUP_COLS)
+        df = load_data()
+        means = df.groupby(["year", by], observed=True)[metric].mean().reset_index()
+        return _year_range(means, start, end)
+
+    def income_trends(self, start=None, end=None):
+        """(연도, 소득그룹)별 1인당 GDP 요약 → DataFrame[year, income_groups, n, mean, w_mean, median, p10, p90]"""
+        trends = load_box_summaries().trends.rename(columns={"group": "income_groups"})
+        return _year_range(trends, start, end)
+
+
+# kind 별 변화량 식 (v1, v2: 두 연도 값, span: 연도 차). GrowthEngine.change 와 같은 정의.
+_CHANGE_SQL = {
+    "change": "v2 - v1",
+    "pct_change": "(v2 - v1) / v1 * 100",
+    "cagr": "CASE WHEN v1 > 0 AND v2 > 0 AND $span <> 0 THEN (exp(ln(v2 / v1) / $span) - 1) * 100 END",
+}
+
+
+class DuckDBBackend:
+    """파티션된 Parquet 데이터셋을 DuckDB 로 질의하는 백엔드."""
+
+    name = "duckdb"
+
+    def __init__(self, path=PARQUET_DIR):
+        self.path = Path(path)
+        self._con = duckdb.connect()
+        self._con.execute(
+            "CREATE VIEW facts AS SELECT * FROM read_parquet("
+            f"{_literal(self.path / '**' / '*.parquet')}, hive_partitioning = true)"
+        )
+        self._local = threading.local()
+
+    def _cursor(self):
+        # DuckDB 연결은 스레드 간 공유하지 않고, 스레드마다 cursor 를 하나씩 씁니다.
+        cur = getattr(self._local, "cursor", None)
+        if cur is None:
+            cur = self._local.cursor = self._con.cursor()
+        return cur
+
+    def query(self, sql, params=None):
+        return self._cursor().execute(sql, params or {}).df()
+
+    def _where(self, start, end, extra=None):
+        clauses = [extra] if extra else []
+        if start is not None:
+            clauses.append("year >= $start")
+        if end is not None:
+            clauses.append("year <= $end")
+        params = {k: v for k, v in (("start", start), ("end", end)) if v is not None}
+        return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def years(self):
+        return self.query("SELECT DISTINCT year FROM facts ORDER BY year")["year"].to_numpy()
+
+    def share_by_year(self, threshold, start=None, end=None):
+        where, params = self._where(start, end)
+        # 분모는 결측을 포함한 연도별 전체 행 수 (pandas 백엔드와 동일)
+        return self.query(f"""
+            SELECT year, 100.0 * count(*) FILTER (WHERE gdp_pcap < $t) / count(*) AS pct
+            FROM facts {where}
+            GROUP BY year ORDER BY year
+        """, {**params, "t": float(threshold)})
+
+    def share_curve(self, thresholds):
+        thresholds = np.asarray(thresholds, dtype=np.float64)
+        long = self.query("""
+            SELECT year, t.i AS i, 100.0 * count(*) FILTER (WHERE gdp_pcap < t.v) / count(*) AS pct
+            FROM facts, (SELECT unnest($ts) AS v, generate_subscripts($ts, 1) - 1 AS i) t
+            GROUP BY year, t.i
+        """, {"ts": thresholds.tolist()})
+        years = np.sort(long["year"].unique())
+        curve = np.full((len(years), len(thresholds)), np.nan)
+        curve[np.searchsorted(years, long["year"]), long["i"].to_numpy()] = long["pct"].to_numpy()
+        return years, curve
+
+    def count_by_region(self, threshold, start=None, end=None):
+        where, params = self._where(start, end, f"{PARTITION_COL} IS NOT NULL")
+        return self.query(f"""
+            SELECT year, {PARTITION_COL}, count(*) FILTER (WHERE gdp_pcap < $t) AS count
+            FROM facts {where}
+            GROUP BY year, {PARTITION_COL} ORDER BY year, {PARTITION_COL}
+        """, {**params, "t": float(threshold)})
+
+    def rankings(self, metric, y1, y2, kinds=KINDS, k=10):
+        metric = _column(metric, METRIC_COLS)
+        y1, y2 = int(y1), int(y2)
+        # 두 연도 row group 과 country·metric 컬럼만 읽은 뒤 국가별로 한 행으로 피벗
+        pair = f"""
+            SELECT country,
+                   CAST(any_value({metric}) FILTER (WHERE year = $y1) AS DOUBLE) AS v1,
+                   CAST(any_value({metric}) FILTER (WHERE year = $y2) AS DOUBLE) AS v2
+            FROM facts WHERE year IN ($y1, $y2)
+            GROUP BY country
+        """
+        out = {}
+        for kind in kinds:
+            if kind not in _CHANGE_SQL:
+                raise ValueError(f"unknown kind: {kind!r}")
+            ranked = f"""
+                WITH pair AS ({pair}),
+                     scored AS (SELECT country, {_CHANGE_SQL[kind]} AS value FROM pair)
+                SELECT country, value AS {kind} FROM scored
+                WHERE value IS NOT NULL AND NOT isnan(value)
+                ORDER BY value {{order}}, country LIMIT $k
+            """
+            params = {"y1": y1, "y2": y2, "k": int(k)}
+            if kind == "cagr":
+                params["span"] = y2 - y1
+            out[kind] = tuple(self.query(ranked.format(order=o), params) for o in ("DESC", "ASC"))
+        return out
+
+    def group_mean(self, metric, by, start=None, end=None):
+        metric, by = _column(metric, METRIC_COLS), _column(by, GROUP_COLS)
+        where, params = self._where(start, end, f"{by} IS NOT NULL")
+        return self.query(f"""
+            SELECT year, {by}, avg({metric}) AS {metric}
+            FROM facts {where}
+            GROUP BY year, {by} ORDER BY year, {by}
+        """, params)
+
+    def income_trends(self, start=None, end=None):
+        where, params = self._where(start, end, "income_groups IS NOT NULL AND gdp_pcap IS NOT NULL")
+        # 분위수는 linear 보간(quantile_cont)으로 pandas 백엔드와 같은 정의
+        return self.query(f"""
+            SELECT year, income_groups,
+                   count(*) AS n,
+                   avg(gdp_pcap::DOUBLE) AS mean,
+                   sum(gdp_pcap::DOUBLE * pop) / sum(pop::DOUBLE) FILTER (WHERE pop IS NOT NULL) AS w_mean,
+                   quantile_cont(gdp_pcap::DOUBLE, 0.5) AS median,
+                   quantile_cont(gdp_pcap::DOUBLE, 0.1) AS p10,
+                   quantile_cont(gdp_pcap::DOUBLE, 0.9) AS p90
+            FROM facts {where}
+            GROUP BY year, income_groups ORDER BY year, income_groups
+        """, params)
+
+
+def export_parquet(src=MERGED_CSV, dest=PARQUET_DIR, force=False):
+    """CSV 를 권역별 파티션·연도순 Parquet 데이터셋으로 씁니다 (DuckDB 스트리밍, 메모리 적재 없음)."""
+    if duckdb is None:
+        raise RuntimeError("duckdb 가 설치되어 있지 않습니다.")
+    dest = Path(dest)
+    if dest.exists():
+        if not force:
+            return dest
+        shutil.rmtree(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    types = {"country": "VARCHAR", "name": "VARCHAR", "world_4region": "VARCHAR", "income_groups": "VARCHAR",
+             "year": "SMALLINT", "gdp_pcap": "FLOAT", "lex": "FLOAT", "pop": "FLOAT"}
+    con = duckdb.connect()
+    con.execute(f"""
+        COPY (SELECT * FROM read_csv({_literal(src)}, header = true, types = {types!r}) ORDER BY year, country)
+        TO {_literal(dest)} (FORMAT PARQUET, PARTITION_BY ({PARTITION_COL}), ROW_GROUP_SIZE {ROW_GROUP_SIZE})
+    """)
+    return dest
+
+
+@st.cache_resource(show_spinner=False)
+def get_backend():
+    """환경 변수로 선택한 질의 백엔드 (프로세스당 하나)."""
+    choice = os.environ.get("GAPMINDER_BACKEND", "pandas").lower()
+    if choice == "duckdb":
+        if duckdb is None:
+            logger.warning("duckdb 가 설치되어 있지 않아 pandas 백엔드를 사용합니다.")
+        elif not PARQUET_DIR.exists():
+            logger.warning("Parquet 데이터셋(%s)이 없어 pandas 백엔드를 사용합니다.", PARQUET_DIR)
+        else:
+            return DuckDBBackend(PARQUET_DIR)
+    elif choice != "pandas":
+        logger.warning("알 수 없는 백엔드 %r, pandas 백엔드를 사용합니다.", choice)
+    return PandasBackend()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DuckDB 백엔드용 Parquet 데이터셋 생성")
+    parser.add_argument("command", choices=["export"])
+    parser.add_argument("--force", action="store_true", help="기존 데이터셋을 지우고 다시 작성")
+    args = parser.parse_args(argv)
+    if duckdb is None:
+        parser.error("duckdb 가 설치되어 있지 않습니다.")
+    print(f"{export_parquet(force=args.force)} 작성 완료")
+
+
+if __name__ == "__main__":
+    main()
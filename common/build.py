@@ -0,0 +1,386 @@
+"""DDF 원본(지표 datapoint 파일 + 국가 엔터티)에서 ``merged_gapminder.csv`` 를 만드는 빌드.
+
+원본은 Gapminder DDF 형식입니다::
+
+    data/ddf/ddf--datapoints--gdp_pcap--by--country--time.csv        # 지표 하나 = 파일 하나
+    data/ddf/ddf--datapoints--pop--by--country-kor--time.csv         # 또는 국가별로 나뉜 파일
+    data/ddf--entities--geo--country.csv                             # 국가 이름·권역·소득그룹
+
+처리 순서:
+
+1. 지표 파일마다 청크 단위로 읽으며 키(국가·연도)와 값의 형식을 검증하고, (국가, 연도) 순으로
+   정렬한 중간 파일(Arrow IPC)을 ``data/cache/build/`` 에 씁니다. 지난 빌드 이후 바뀌지 않은
+   파일(크기·수정시각, 필요하면 SHA-256 비교)은 건너뜁니다.
+2. 중간 파일을 메모리 매핑으로 열어 국가 묶음 단위로 병합합니다. 행의 기준은 인구(``pop``)
+   지표이고 다른 지표는 왼쪽 조인, 국가 속성은 엔터티 표와 내부 조인입니다. 모든 지표를
+   한꺼번에 메모리에 올리지 않고 묶음마다 CSV 에 씁니다. 출력이 대시보드가 읽는
+   ``data/merged_gapminder.csv`` 이면 같은 묶음을 Arrow 캐시(``common.cache``)에도 씁니다.
+3. 출력이 ``data/merged_gapminder.csv`` 이면 대시보드의 나머지 원본 캐시(국가 엔터티 등)를
+   최신으로 만든 뒤 공유 파생 인덱스 번들(``common.shared``)을 다시 발행합니다
+   (``--no-indexes`` 로 생략).
+
+증분 처리는 1단계(중간 파일 만들기)에만 해당합니다. 원본이 하나라도 바뀌면 2단계는 모든
+국가를 다시 병합해 출력 전체를 새로 씁니다. 빌드 상태는 병합 직후 기록하므로 3단계가 실패해도
+다음 실행은 병합을 반복하지 않고 번들만 발행합니다. 바뀐 것이 없고 출력과 번들이 최신이면
+아무것도 하지 않습니다.
+
+사용법::
+
+    python -m common.build                     # 바뀐 원본만 다시 처리
+    python -m common.build --force             # 전부 다시 처리
+    python -m common.build --source path/to/ddf --output data/merged_gapminder.csv
+"""
+import argparse
+import contextlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from common import cache
+from common.data import CATEGORY_COLS, DATA_DIR, DTYPES, GEO_CSV, MERGED_CSV, MERGED_SCHEMA, METRIC_COLS
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow 미설치 시 빌드 불가
+    pa = None
+
+DDF_DIR = DATA_DIR / "ddf"
+BUILD_DIR = cache.CACHE_DIR / "build"
+STATE_FILE = BUILD_DIR / "state.json"
+STATE_VERSION = 1
+
+SPINE = "pop"
+OUTPUT_COLS = ["country", "name", "year", "gdp_pcap", "lex", "pop", "world_4region", "income_groups"]
+GEO_ATTRS = ["name", "world_4region", "income_groups"]
+KEY_ALIASES = {"country": ("country", "geo"), "year": ("time", "year")}
+
+CHUNK_ROWS = 100_000
+COUNTRIES_PER_BATCH = 64
+# 기존 배포 CSV 와 같은 형식: 정수 지표는 정수로, 실수는 파이썬 repr 로, 줄바꿈은 CRLF
+LINE_TERMINATOR = "\r\n"
+
+_DATAPOINT_RE = re.compile(r"^ddf--datapoints--(?P<indicator>\w+?)--by--(?P<key>[\w-]+?)--time\.csv$")
+
+
+class ValidationError(ValueError):
+    """원본 파일의 키·형식이 올바르지 않을 때."""
+
+
+def find_sources(source_dir, indicators):
+    """지표 → 원본 파일 목록 (이름순)."""
+    found = {ind: [] for ind in indicators}
+    for path in sorted(Path(source_dir).glob("ddf--datapoints--*.csv")):
+        m = _DATAPOINT_RE.match(path.name)
+        if m and m["indicator"] in found:
+            found[m["indicator"]].append(path)
+    missing = [ind for ind, paths in found.items() if not paths]
+    if missing:
+        raise FileNotFoundError(f"{source_dir} 에 지표 원본이 없습니다: {', '.join(missing)}")
+    return found
+
+
+def _key_column(columns, key, path):
+    for alias in KEY_ALIASES[key]:
+        if alias in columns:
+            return alias
+    raise ValidationError(f"{path.name}: {key} 키 컬럼({'/'.join(KEY_ALIASES[key])})이 없습니다.")
+
+
+def _validate_chunk(chunk, path, indicator, key_cols, row0):
+    country = chunk[key_cols[0]].str.strip()
+    if country.isna().any() or (country == "").any():
+        raise ValidationError(f"{path.name}: {row0 + int(np.argmax(country.isna() | (country == '')))}행에 국가 키가 없습니다.")
+    year = pd.to_numeric(chunk[key_cols[1]], errors="coerce")
+    bad = year.isna() | (year % 1 != 0)
+    if bad.any():
+        raise ValidationError(f"{path.name}: 정수가 아닌 연도 {chunk[key_cols[1]][bad].iloc[0]!r} ({int(bad.sum())}행)")
+    raw = chunk[indicator]
+    value = pd.to_numeric(raw, errors="coerce")
+    bad = value.isna() & raw.notna() & (raw.str.strip() != "")
+    if bad.any():
+        raise ValidationError(f"{path.name}: 숫자가 아닌 {indicator} 값 {raw[bad].iloc[0]!r} ({int(bad.sum())}행)")
+    return country.to_numpy(dtype=object), year.to_numpy(dtype=np.int64), value.to_numpy(dtype=np.float64)
+
+
+def stage_file(path, indicator, out_path):
+    """원본 지표 파일 하나를 검증·정렬해 중간 파일로 씁니다. 행 수를 반환합니다."""
+    reader = pd.read_csv(path, dtype=str, keep_default_na=False, na_values=[""], chunksize=CHUNK_ROWS)
+    parts, row0, key_cols = [], 0, None
+    for chunk in reader:
+        if key_cols is None:
+            key_cols = (_key_column(chunk.columns, "country", path), _key_column(chunk.columns, "year", path))
+            if indicator not in chunk.columns:
+                raise ValidationError(f"{path.name}: {indicator} 값 컬럼이 없습니다.")
+        parts.append(_validate_chunk(chunk, path, indicator, key_cols, row0))
+        row0 += len(chunk)
+    if not parts:
+        raise ValidationError(f"{path.name}: 데이터 행이 없습니다.")
+    country, year, value = (np.concatenate(cols) for cols in zip(*parts))
+    order = np.lexsort((year, country))
+    country, year, value = country[order], year[order], value[order]
+    dup = (country[1:] == country[:-1]) & (year[1:] == year[:-1])
+    if dup.any():
+        i = int(np.argmax(dup))
+        raise ValidationError(f"{path.name}: 중복 키 ({country[i]}, {year[i]}) 등 {int(dup.sum())}건")
+    table = pa.table({
+        "country": pa.array(country, pa.string()),
+        "year": pa.array(year, pa.int16()),
+        "value": pa.array(value, pa.float64()),
+    })
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(p):
+        with pa.OSFile(str(p), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    cache.write_atomic(out_path, write)
+    return len(table)
+
+
+class StagedIndicator:
+    """한 지표의 중간 파일들을 메모리 매핑으로 열고 국가별 행 구간을 찾습니다."""
+
+    def __init__(self, paths):
+        self.slices = {}
+        self.tables = []
+        self.integral = True
+        for path in paths:
+            table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+            countries = table.column("country").to_numpy(zero_copy_only=False)
+            names, starts = np.unique(countries, return_index=True)
+            ends = np.append(starts[1:], len(countries))
+            values = table.column("value").to_numpy()
+            self.integral = self.integral and bool(np.all(np.isnan(values) | (values % 1 == 0)))
+            t = len(self.tables)
+            self.tables.append(table)
+            for name, start, end in zip(names, starts, ends):
+                if name in self.slices:
+                    raise ValidationError(f"{path.name}: 국가 {name} 가 여러 원본 파일에 있습니다.")
+                self.slices[name] = (t, int(start), int(end))
+
+    def rows(self, country):
+        """(연도 배열, 값 배열). 없으면 빈 배열."""
+        if country not in self.slices:
+            return np.empty(0, np.int16), np.empty(0, np.float64)
+        t, start, end = self.slices[country]
+        part = self.tables[t].slice(start, end - start)
+        return part.column("year").to_numpy(), part.column("value").to_numpy()
+
+
+def _read_entities(geo_path):
+    geo = pd.read_csv(geo_path, dtype=str, usecols=["country", *GEO_ATTRS]).set_index("country")
+    if geo.index.duplicated().any():
+        raise ValidationError(f"{Path(geo_path).name}: 중복 국가 키 {geo.index[geo.index.duplicated()][0]!r}")
+    return geo
+
+
+def _merge_batch(countries, staged, geo):
+    """국가 묶음의 병합 행 (DataFrame, OUTPUT_COLS 순서, float64 지표)."""
+    frames = []
+    for country in countries:
+        years, spine = staged[SPINE].rows(country)
+        frame = {"country": country, "year": years.astype(np.int64)}
+        for indicator, ind in staged.items():
+            if indicator == SPINE:
+                frame[indicator] = spine
+                continue
+            ys, vs = ind.rows(country)
+            pos = np.searchsorted(ys, years)
+            pos = np.minimum(pos, max(len(ys) - 1, 0))
+            hit = (ys[pos] == years) if len(ys) else np.zeros(len(years), bool)
+            frame[indicator] = np.where(hit, vs[pos] if len(vs) else np.nan, np.nan)
+        frames.append(pd.DataFrame(frame))
+    batch = pd.concat(frames, ignore_index=True)
+    for indicator, ind in staged.items():
+        if ind.integral:
+            batch[indicator] = batch[indicator].astype("Int64")
+    for attr in GEO_ATTRS:
+        batch[attr] = batch["country"].map(geo[attr])
+    return batch[OUTPUT_COLS]
+
+
+def _dictionaries(countries, geo):
+    """출력 전체의 범주 사전 (read_csv(dtype=category) 와 같은 정렬된 범주)."""
+    present = geo.loc[countries]
+    dicts = {"country": sorted(countries)}
+    for attr in GEO_ATTRS:
+        dicts[attr] = sorted(present[attr].dropna().unique())
+    return {col: pa.array(dicts[col], pa.string()) for col in CATEGORY_COLS}
+
+
+def _to_batch(batch, dictionaries):
+    arrays = {}
+    for col in OUTPUT_COLS:
+        if col in dictionaries:
+            values = batch[col]
+            codes = pd.Categorical(values, categories=dictionaries[col].to_pylist()).codes
+            indices = pa.array(codes, pa.int32(), mask=codes < 0)
+            arrays[col] = pa.DictionaryArray.from_arrays(indices, dictionaries[col])
+        else:
+            arrays[col] = pa.array(batch[col].to_numpy(dtype=np.float64, na_value=np.nan).astype(DTYPES[col]))
+    return pa.record_batch(arrays)
+
+
+def _is_live(output):
+    """대시보드가 읽는 병합 CSV 인지 (Arrow 캐시·인덱스 번들은 이 경우에만 갱신)."""
+    return Path(output).resolve() == MERGED_CSV.resolve()
+
+
+def merge(staged, geo, output):
+    """모든 국가를 묶음 단위로 병합해 CSV 를 씁니다. 행 수를 반환합니다.
+
+    출력이 대시보드의 병합 CSV 이면 Arrow 캐시도 함께 씁니다. 캐시 파일은 원본 파일 이름으로
+    구분되므로, 다른 경로의 같은 이름 출력이 대시보드 캐시를 덮어쓰지 않도록 합니다.
+    """
+    countries = sorted(c for c in staged[SPINE].slices if c in geo.index)
+    dropped = len(staged[SPINE].slices) - len(countries)
+    if dropped:
+        print(f"경고: 엔터티 표에 없는 국가 {dropped}개는 제외합니다.")
+    dictionaries = _dictionaries(countries, geo)
+
+    output = Path(output)
+    tmp_csv = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+    tmp_arrow = None
+    if _is_live(output):
+        cache.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_arrow = cache.cache_path(output).with_name(f".{output.stem}.{os.getpid()}.arrow.tmp")
+    n_rows = 0
+    writer = None
+    try:
+        with open(tmp_csv, "w", newline="") as f, \
+                (pa.OSFile(str(tmp_arrow), "wb") if tmp_arrow else contextlib.nullcontext()) as sink:
+            for i in range(0, len(countries), COUNTRIES_PER_BATCH):
+                batch = _merge_batch(countries[i:i + COUNTRIES_PER_BATCH], staged, geo)
+                batch.to_csv(f, index=False, header=(i == 0), lineterminator=LINE_TERMINATOR)
+                n_rows += len(batch)
+                if sink is None:
+                    continue
+                record = _to_batch(batch, dictionaries)
+                if writer is None:
+                    writer = pa.ipc.new_file(sink, record.schema)
+                writer.write_batch(record)
+            if writer is not None:
+                writer.close()
+        os.replace(tmp_csv, output)
+        if tmp_arrow:
+            # CSV 를 제자리에 둔 뒤 캐시를 설치해야 메타의 원본 지문이 새 CSV 와 일치합니다.
+            cache.install(output, tmp_arrow, MERGED_SCHEMA)
+    finally:
+        for tmp in (tmp_csv, tmp_arrow):
+            if tmp and tmp.exists():
+                tmp.unlink()
+    return n_rows
+
+
+def _publish_indexes():
+    """대시보드 원본 캐시를 모두 최신으로 만들고, 현재 번들이 없으면 발행합니다. 발행했으면 True."""
+    from common import data, shared
+
+    for src, (reader, schema) in data.SOURCES.items():
+        if not cache.is_fresh(src, schema):
+            cache.build(src, reader, schema)
+    token = shared.bundle_token()
+    if (shared.SHARED_DIR / token / shared.BUNDLE_FILE).exists():
+        return False
+    shared.publish(shared.build_all(), token)
+    return True
+
+
+def _load_state():
+    if STATE_FILE.exists():
+        state = json.loads(STATE_FILE.read_text())
+        if state.get("version") == STATE_VERSION:
+            return state
+    return {"version": STATE_VERSION, "files": {}}
+
+
+def _unchanged(path, recorded):
+    if not recorded or "size" not in recorded or not Path(recorded["staged"]).exists():
+        return False
+    fp = cache.fingerprint(path, with_hash=False)
+    if fp["size"] != recorded["size"]:
+        return False
+    return fp["mtime_ns"] == recorded["mtime_ns"] or cache.sha256(path) == recorded["sha256"]
+
+
+def build(source_dir=DDF_DIR, geo_path=GEO_CSV, output=MERGED_CSV, indicators=METRIC_COLS,
+          force=False, indexes=True):
+    """바뀐 원본만 다시 스테이징하고, 변경이 있으면 병합 CSV(·캐시·인덱스 번들)를 새로 씁니다.
+
+    요약 dict 를 반환합니다.
+    """
+    if pa is None:
+        raise RuntimeError("pyarrow 가 설치되어 있지 않습니다.")
+    started = time.perf_counter()
+    sources = find_sources(source_dir, indicators)
+    state = _load_state()
+    files = {}
+    staged_paths = {ind: [] for ind in indicators}
+    restaged = []
+    for indicator, paths in sources.items():
+        for path in paths:
+            key = str(Path(path).resolve())
+            recorded = state["files"].get(key)
+            if force or not _unchanged(path, recorded):
+                out = BUILD_DIR / indicator / f"{path.stem}.arrow"
+                rows = stage_file(path, indicator, out)
+                recorded = {**cache.fingerprint(path), "staged": str(out), "rows": rows}
+                restaged.append(path.name)
+            files[key] = recorded
+            staged_paths[indicator].append(Path(recorded["staged"]))
+
+    geo_key = str(Path(geo_path).resolve())
+    geo_changed = force or not _unchanged(geo_path, {**state["files"].get(geo_key, {}), "staged": str(geo_path)})
+    files[geo_key] = {**cache.fingerprint(geo_path), "staged": str(geo_path)}
+    removed = set(state["files"]) - set(files)
+
+    summary = {"restaged": restaged, "removed": len(removed), "rows": None, "published": False, "seconds": None}
+    output_key = str(Path(output).resolve())
+    if _is_live(output):
+        output_fresh = cache.is_fresh(output, MERGED_SCHEMA)
+    else:
+        output_fresh = Path(output).exists() and state.get("output") == output_key
+    up_to_date = not (restaged or removed or geo_changed) and output_fresh
+    if not up_to_date:
+        staged = {ind: StagedIndicator(paths) for ind, paths in staged_paths.items()}
+        summary["rows"] = merge(staged, _read_entities(geo_path), output)
+    state["files"] = files
+    state["output"] = output_key
+    BUILD_DIR.mkdir(parents=True, exist_ok=True)
+    cache.write_atomic(STATE_FILE, lambda p: p.write_text(json.dumps(state, indent=1)))
+    if indexes and _is_live(output):
+        summary["published"] = _publish_indexes()
+    summary["seconds"] = round(time.perf_counter() - started, 3)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="DDF 원본 → merged_gapminder.csv 빌드 (원본 스테이징만 증분, 변경 시 병합은 전체 다시 작성)"
+    )
+    parser.add_argument("--source", type=Path, default=DDF_DIR, help="ddf--datapoints--*.csv 가 있는 디렉터리")
+    parser.add_argument("--geo", type=Path, default=GEO_CSV, help="국가 엔터티 CSV")
+    parser.add_argument("--output", type=Path, default=MERGED_CSV, help="병합 CSV 경로")
+    parser.add_argument("--force", action="store_true", help="변경 여부와 관계없이 전부 다시 처리")
+    parser.add_argument("--no-indexes", action="store_true", help="공유 인덱스 번들을 발행하지 않음")
+    args = parser.parse_args(argv)
+    try:
+        summary = build(args.source, args.geo, args.output, force=args.force, indexes=not args.no_indexes)
+    except (ValidationError, FileNotFoundError) as e:
+        parser.exit(1, f"빌드 실패: {e}\n")
+    if summary["rows"] is not None:
+        print(f"빌드 완료: {args.output} {summary['rows']:,}행, 다시 처리한 원본 {len(summary['restaged'])}개 "
+              f"({summary['seconds']}s)")
+    elif summary["published"]:
+        print(f"인덱스 번들 발행 완료 ({summary['seconds']}s)")
+    else:
+        print(f"최신 상태 ({summary['seconds']}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""CSV 원본을 메모리 매핑 가능한 Arrow IPC 파일로 캐시합니다.
+
+원본 CSV 의 크기·수정시각(필요하면 SHA-256)과 리더 스키마를 메타 파일에 기록해 두고,
+원본이나 스키마가 바뀐 경우에만 캐시를 다시 만듭니다. pyarrow 가 없거나 캐시를 쓸 수 없는
+환경에서는 그냥 CSV 를 읽습니다.
+
+빌드만 따로 하려면::
+
+    python -m common.cache          # 바뀐 원본만 다시 빌드
+    python -m common.cache --force  # 전부 다시 빌드
+"""
+import argparse
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow 미설치 시 CSV 로만 동작
+    pa = None
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "cache"
+FORMAT_VERSION = 1
+
+
+def cache_path(src):
+    return CACHE_DIR / f"{Path(src).stem}.arrow"
+
+
+def _meta_path(src):
+    return CACHE_DIR / f"{Path(src).stem}.json"
+
+
+def sha256(path):
+    """파일 내용의 SHA-256 (16진 문자열)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def fingerprint(src, with_hash=True, schema=None):
+    """원본 지문: 형식 버전·스키마·크기·수정시각 (with_hash 면 SHA-256 포함)."""
+    st = os.stat(src)
+    fp = {"version": FORMAT_VERSION, "schema": schema, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if with_hash:
+        fp["sha256"] = sha256(src)
+    return fp
+
+
+def write_atomic(path, write):
+    """임시 파일에 쓴 뒤 교체하여, 동시에 읽는 프로세스가 반쯤 쓴 파일을 보지 않게 합니다."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def is_fresh(src, schema=None):
+    """캐시가 존재하고 원본·스키마와 일치하면 True."""
+    meta_path = _meta_path(src)
+    if not cache_path(src).exists() or not meta_path.exists():
+        return False
+    meta = json.loads(meta_path.read_text())
+    fp = fingerprint(src, with_hash=False, schema=schema)
+    if any(meta.get(k) != fp[k] for k in ("version", "schema", "size")):
+        return False
+    if meta.get("mtime_ns") == fp["mtime_ns"]:
+        return True
+    # 수정시각만 바뀐 경우(체크아웃, touch 등)는 내용 해시로 판단
+    if meta.get("sha256") != sha256(src):
+        return False
+    meta["mtime_ns"] = fp["mtime_ns"]
+    write_atomic(meta_path, lambda p: p.write_text(json.dumps(meta)))
+    return True
+
+
+def _to_arrow(df):
+    # 실수 컬럼은 NaN 을 null 로 바꾸지 않고 그대로 저장해야 읽을 때 복사 없이 매핑됩니다.
+    cols = {}
+    for col in df.columns:
+        s = df[col]
+        if isinstance(s.dtype, pd.CategoricalDtype) or not pd.api.types.is_numeric_dtype(s.dtype):
+            cols[col] = pa.Array.from_pandas(s)
+        else:
+            cols[col] = pa.array(s.to_numpy())
+    return pa.table(cols)
+
+
+def build(src, reader, schema=None):
+    """reader() 결과를 Arrow IPC 캐시로 저장하고 그 DataFrame 을 반환합니다.
+
+    schema 는 reader 의 출력 형태(컬럼·dtype·정렬 등)를 나타내는 JSON 직렬화 가능한 값으로,
+    바뀌면 원본이 그대로여도 캐시를 다시 만듭니다.
+    """
+    df = reader()
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    table = _to_arrow(df)
+
+    def write(path):
+        with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    write_atomic(cache_path(src), write)
+    write_atomic(_meta_path(src), lambda p: p.write_text(json.dumps(fingerprint(src, schema=schema))))
+    return df
+
+
+def install(src, built, schema=None):
+    """따로 만든 Arrow IPC 파일(built)을 src 의 캐시로 옮기고 메타를 씁니다.
+
+    src 를 다 쓴 뒤에 호출해야 메타의 원본 지문이 맞습니다 (``common.build`` 에서 사용).
+    """
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    os.replace(built, cache_path(src))
+    write_atomic(_meta_path(src), lambda p: p.write_text(json.dumps(fingerprint(src, schema=schema))))
+
+
+def read_cache(src):
+    """캐시를 메모리 매핑으로 읽습니다. 결측 없는 숫자 컬럼은 복사 없이 매핑됩니다."""
+    table = pa.ipc.open_file(pa.memory_map(str(cache_path(src)), "r")).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+def load(src, reader, schema=None):
+    """캐시가 최신이면 캐시를, 아니면 CSV 를 읽고 캐시를 갱신합니다."""
+    if pa is None:
+        return reader()
+    try:
+        if is_fresh(src, schema):
+            return read_cache(src)
+        return build(src, reader, schema)
+    except OSError:
+        # 읽기 전용 파일시스템 등: 캐시 없이 CSV 로 대체
+        return reader()
+
+
+def main(argv=None):
+    from common import data
+
+    parser = argparse.ArgumentParser(description="Gapminder CSV → Arrow IPC 캐시 빌드")
+    parser.add_argument("--force", action="store_true", help="원본 변경 여부와 관계없이 다시 빌드")
+    args = parser.parse_args(argv)
+    if pa is None:
+        parser.error("pyarrow 가 설치되어 있지 않습니다.")
+    for src, (reader, schema) in data.SOURCES.items():
+        if not args.force and is_fresh(src, schema):
+            print(f"최신 상태: {cache_path(src).name}")
+            continue
+        build(src, reader, schema)
+        print(f"빌드 완료: {cache_path(src).name}")
+
+
+if __name__ == "__main__":
+    main()
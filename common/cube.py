@@ -0,0 +1,65 @@
+"""연도 × 국가 지표 큐브.
+
+``values[metric, year, country]`` 형태의 밀집 float32 배열입니다. 연도·국가 인덱스는
+고정된 정수 위치이므로 특정 연도의 국가별 값은 연속된 벡터 하나로 바로 읽을 수 있습니다
+(필터링·pivot 불필요). 관측되지 않은 (연도, 국가) 칸은 NaN 입니다.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from common import shared
+from common.data import METRIC_COLS, load_data
+
+
+class MetricCube:
+    def __init__(self, df, metrics=METRIC_COLS):
+        self.metrics = list(metrics)
+        self.year_min = int(df["year"].min())
+        self.years = np.arange(self.year_min, int(df["year"].max()) + 1)
+        self.countries = pd.Index(df["country"].cat.categories)
+
+        yi = df["year"].to_numpy().astype(np.intp) - self.year_min
+        ci = df["country"].cat.codes.to_numpy()
+        values = np.full((len(self.metrics), len(self.years), len(self.countries)), np.nan, dtype=np.float32)
+        for m, metric in enumerate(self.metrics):
+            values[m, yi, ci] = df[metric].to_numpy()
+        values.flags.writeable = False
+        self.values = values
+        self._metric_pos = {metric: m for m, metric in enumerate(self.metrics)}
+
+    def metric_index(self, metric):
+        return self._metric_pos[metric]
+
+    def year_index(self, year):
+        i = int(year) - self.year_min
+        if not 0 <= i < len(self.years):
+            raise KeyError(year)
+        return i
+
+    def country_index(self, country):
+        return self.countries.get_loc(country)
+
+    def get_matrix(self, metric):
+        """(연도 × 국가) 행렬 전체."""
+        return self.values[self.metric_index(metric)]
+
+    def get_slice(self, metric, year):
+        """한 연도의 국가별 값 (길이 = 국가 수)."""
+        return self.values[self.metric_index(metric), self.year_index(year)]
+
+    def get_pair(self, metric, y1, y2):
+        """두 연도의 국가별 값 벡터 쌍."""
+        m = self.metric_index(metric)
+        return self.values[m, self.year_index(y1)], self.values[m, self.year_index(y2)]
+
+    def get_series(self, metric, country):
+        """한 국가의 연도별 값 (길이 = 연도 수)."""
+        return self.values[self.metric_index(metric), :, self.country_index(country)]
+
+
+@st.cache_resource(show_spinner=False)
+@shared.resource("cube")
+def load_cube():
+    """공유 데이터셋으로 만든 지표 큐브 (프로세스당 1회 생성)."""
+    return MetricCube(load_data())
@@ -0,0 +1,89 @@
+"""Gapminder 데이터셋 공통 로더.
+
+모든 페이지가 이 모듈의 ``load_data()`` 를 사용합니다. 데이터는 프로세스당 한 번만
+파싱되며(``st.cache_resource``), 세션·페이지 사이에 같은 객체를 공유합니다.
+공유 객체이므로 숫자 컬럼은 읽기 전용 배열로 만들어 실수로 덮어쓰지 않도록 막습니다.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from common import cache
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+MERGED_CSV = DATA_DIR / "merged_gapminder.csv"
+GEO_CSV = DATA_DIR / "ddf--entities--geo--country.csv"
+
+CATEGORY_COLS = ["country", "name", "world_4region", "income_groups"]
+METRIC_COLS = ["gdp_pcap", "lex", "pop"]
+DTYPES = {
+    **{c: "category" for c in CATEGORY_COLS},
+    "year": "int16",
+    **{c: "float32" for c in METRIC_COLS},
+}
+
+# 팩트 행 정렬 순서: 국가별 행이 연속 구간이 되도록 (country, year) 로 정렬해 둡니다.
+SORT_KEYS = ["country", "year"]
+MERGED_SCHEMA = {"dtypes": DTYPES, "sort": SORT_KEYS}
+
+GEO_COLS = ["country", "name", "iso3166_1_alpha2", "iso3166_1_alpha3", "world_4region"]
+
+# 화면 표시용 국가명 오버라이드 (06, 09 페이지 공통)
+NAME_OVERRIDES = {
+    "South Korea": "Republic of Korea",
+    "USA": "United States",
+    "UK": "United Kingdom",
+}
+
+
+def _freeze(df):
+    """컬럼별 배열을 읽기 전용으로 고정한 DataFrame 을 돌려줍니다."""
+    cols = {}
+    for col in df.columns:
+        values = df[col].array if isinstance(df[col].dtype, pd.CategoricalDtype) else df[col].to_numpy()
+        # Arrow 캐시에서 매핑된 배열은 이미 읽기 전용이므로 복사하지 않습니다.
+        if isinstance(values, np.ndarray) and values.flags.writeable:
+            values = values.copy()
+            values.flags.writeable = False
+        cols[col] = values
+    return pd.DataFrame(cols, copy=False)
+
+
+def read_merged():
+    """merged_gapminder.csv 를 압축 dtype 으로 읽어 (country, year) 순으로 정렬합니다 (캐시 없음)."""
+    return pd.read_csv(MERGED_CSV, dtype=DTYPES).sort_values(SORT_KEYS, ignore_index=True)
+
+
+def read_geo():
+    """국가 엔터티 CSV 에서 필요한 컬럼만 읽습니다 (캐시 없음)."""
+    return pd.read_csv(GEO_CSV, usecols=GEO_COLS, dtype="string")
+
+
+# 캐시 대상 원본 → (원본 리더, 스키마) (python -m common.cache 에서도 사용)
+SOURCES = {
+    MERGED_CSV: (read_merged, MERGED_SCHEMA),
+    GEO_CSV: (read_geo, GEO_COLS),
+}
+
+
+@st.cache_resource(show_spinner=False)
+def load_data():
+    """공유 데이터셋(읽기 전용)을 반환합니다. 반환값을 수정하지 마세요."""
+    return _freeze(cache.load(MERGED_CSV, read_merged, MERGED_SCHEMA))
+
+
+@st.cache_resource(show_spinner=False)
+def load_geo():
+    """국가 엔터티 테이블(country, full_name, iso2, iso3, world_4region)을 반환합니다."""
+    geo = cache.load(GEO_CSV, read_geo, GEO_COLS).astype("string").rename(columns={
+        "name": "full_name", "iso3166_1_alpha2": "iso2", "iso3166_1_alpha3": "iso3",
+    })
+    geo["full_name"] = geo["full_name"].replace(NAME_OVERRIDES)
+    return geo.set_index("country")
+
+
+def country_names():
+    """country 코드 → 표시용 전체 국가명 매핑."""
+    return load_geo()["full_name"].to_dict()
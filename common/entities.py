@@ -0,0 +1,68 @@
+"""국가 엔터티 차원 테이블과 국가별 연속 구간 인덱스.
+
+공유 데이터셋은 (country, year) 순으로 정렬되어 있으므로 각 국가의 행은 하나의 연속
+구간입니다. ``CountryIndex`` 는 국가별 시작 위치만 저장해 두고, 선택한 국가·연도 범위의
+행을 전체 테이블 마스크 대신 오프셋 계산으로 꺼냅니다.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from common import shared
+from common.data import load_data, load_geo
+
+
+def _flag(iso2):
+    """ISO alpha-2 코드 → 국기 이모지 (지역 표시 문자 2개)."""
+    if not isinstance(iso2, str) or len(iso2) != 2 or not iso2.isalpha():
+        return ""
+    return "".join(chr(0x1F1E6 + ord(c) - ord("A")) for c in iso2.upper())
+
+
+@st.cache_resource(show_spinner=False)
+def load_entities():
+    """데이터셋에 등장하는 국가의 차원 테이블 (index=country).
+
+    columns: full_name, flag, iso2, iso3, world_4region
+    """
+    geo = load_geo()
+    codes = load_data()["country"].cat.categories
+    ent = geo.reindex(pd.Index(codes, name="country"))
+    ent["flag"] = ent["iso2"].map(_flag, na_action="ignore").fillna("")
+    return ent[["full_name", "flag", "iso2", "iso3", "world_4region"]]
+
+
+class CountryIndex:
+    def __init__(self, df):
+        codes = df["country"].cat.codes.to_numpy()
+        if np.any(np.diff(codes) < 0):
+            raise ValueError("데이터셋이 (country, year) 순으로 정렬되어 있지 않습니다.")
+        self.df = df
+        self.countries = pd.Index(df["country"].cat.categories)
+        self.bounds = np.searchsorted(codes, np.arange(len(self.countries) + 1))
+        self.years = df["year"].to_numpy()
+
+    def positions(self, countries, start=None, end=None):
+        """선택 국가·연도 범위에 해당하는 행 위치 (국가 선택 순서대로)."""
+        parts = []
+        for loc in self.countries.get_indexer(countries):
+            if loc < 0:
+                continue
+            lo, hi = self.bounds[loc], self.bounds[loc + 1]
+            years = self.years[lo:hi]
+            if start is not None:
+                lo = lo + np.searchsorted(years, start, side="left")
+            if end is not None:
+                hi = self.bounds[loc] + np.searchsorted(years, end, side="right")
+            parts.append(np.arange(lo, max(lo, hi)))
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.intp)
+
+    def select(self, countries, start=None, end=None):
+        """선택 국가·연도 범위의 팩트 행."""
+        return self.df.iloc[self.positions(countries, start, end)]
+
+
+@st.cache_resource(show_spinner=False)
+@shared.resource("country_index")
+def load_country_index():
+    return CountryIndex(load_data())
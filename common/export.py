@@ -0,0 +1,266 @@
+"""페이지 그림을 정적 HTML/PNG 로 일괄 내보내기 (수업 자료용 오프라인 묶음).
+
+(페이지, 위젯 상태) 목록을 받아 각 페이지 스크립트를 Streamlit AppTest 로 헤드리스 실행하고,
+``show_chart`` 에 전달된 그림을 그대로 모아 파일로 씁니다. 페이지와 같은 코드로 그림을
+만들므로 화면과 내보낸 결과가 어긋나지 않습니다.
+
+- 작업은 프로세스 풀에서 병렬로 실행됩니다. 워커는 프로세스당 데이터·캐시를 한 번만 올리고
+  여러 작업을 이어서 처리합니다.
+- HTML 은 plotly.js 를 내장하지 않고 출력 루트의 ``plotly.min.js`` 하나를 함께 씁니다.
+- PNG 는 kaleido 가 설치된 경우에만 씁니다 (없으면 경고 후 HTML 만).
+- ``manifest.json`` 에 작업별 입력 해시(페이지·공통 모듈 소스, 데이터 번들 식별자, 위젯 상태)와
+  파일별 그림 해시를 기록해, 입력이 같은 작업은 실행하지 않고 그림이 같은 파일은 다시 쓰지 않습니다.
+
+작업 파일은 JSON 목록이며 위젯 상태는 화면의 위젯 라벨로 지정합니다::
+
+    [
+      {"page": "02", "name": "threshold-500", "state": {"저소득 기준 (USD)": 500}},
+      {"page": "03", "name": "wide", "state": {"기간 선택": [1900, 2020]}}
+    ]
+
+사용법 (저장소 루트에서)::
+
+    python -m common.export                       # 모든 페이지의 기본 상태
+    python -m common.export jobs.json --workers 8 --formats html,png
+    python -m common.export jobs.json --force      # 해시와 관계없이 다시 내보내기
+"""
+import argparse
+import hashlib
+import importlib
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+try:
+    import kaleido
+except ImportError:  # kaleido 미설치 시 PNG 는 건너뜀
+    kaleido = None
+
+logger = logging.getLogger("gapminder.export")
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES_DIR = ROOT / "pages"
+DEFAULT_OUT = ROOT / "exports"
+MANIFEST = "manifest.json"
+PLOTLY_JS = "plotly.min.js"
+FORMATS = ("html", "png")
+TIMEOUT = 300
+
+# 위젯 라벨로 찾을 AppTest 위젯 종류
+WIDGET_KINDS = ("slider", "select_slider", "number_input", "radio", "selectbox",
+                "multiselect", "toggle", "checkbox", "text_input")
+RANGE_KINDS = ("slider", "select_slider")
+
+
+def page_script(page):
+    """'02' 같은 접두어로 페이지 파일을 찾습니다."""
+    matches = sorted(PAGES_DIR.glob(f"{page}*.py"))
+    if not matches:
+        raise ValueError(f"페이지를 찾을 수 없습니다: {page!r}")
+    return matches[0]
+
+
+def default_jobs():
+    """모든 페이지의 기본 위젯 상태."""
+    return [{"page": p.name[:2], "name": "default", "state": {}} for p in sorted(PAGES_DIR.glob("[0-9][0-9]_*.py"))]
+
+
+def load_jobs(path):
+    jobs = json.loads(Path(path).read_text(encoding="utf-8"))
+    seen = set()
+    for job in jobs:
+        job.setdefault("name", "default")
+        job.setdefault("state", {})
+        page_script(job["page"])
+        job_id = f"{job['page']}/{job['name']}"
+        if job_id in seen:
+            raise ValueError(f"작업 이름이 중복됩니다: {job_id}")
+        seen.add(job_id)
+    return jobs
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def code_token():
+    """그림에 영향을 주는 입력의 해시: 공통 모듈 소스와 데이터 번들 식별자."""
+    from common import shared
+
+    h = hashlib.sha256()
+    for path in sorted((ROOT / "common").glob("*.py")):
+        h.update(path.read_bytes())
+    h.update(str(shared.bundle_token()).encode())
+    return h.hexdigest()
+
+
+def job_key(job, token):
+    state = json.dumps(job["state"], sort_keys=True, ensure_ascii=False)
+    return _digest(token.encode() + page_script(job["page"]).read_bytes() + state.encode())
+
+
+def _find_widget(at, label):
+    for kind in WIDGET_KINDS:
+        for widget in at.get(kind):
+            if widget.label == label:
+                return kind, widget
+    raise ValueError(f"위젯을 찾을 수 없습니다: {label!r}")
+
+
+def _init_worker():
+    os.chdir(ROOT)
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    # 워커는 작업마다 필요한 집계만 계산하면 되므로 백그라운드 워밍업을 끔
+    os.environ["GAPMINDER_WARMUP"] = "0"
+    logging.getLogger("gapminder.trace").setLevel(logging.WARNING)
+
+
+def collect_figures(job):
+    """페이지를 job 의 위젯 상태로 실행하고 그려진 그림의 JSON 목록을 반환합니다."""
+    from streamlit.testing.v1 import AppTest
+
+    from common.render import capture_figures
+
+    at = AppTest.from_file(str(page_script(job["page"])), default_timeout=TIMEOUT).run()
+    for label, value in job["state"].items():
+        kind, widget = _find_widget(at, label)
+        if kind in RANGE_KINDS and isinstance(value, list):
+            value = tuple(value)
+        widget.set_value(value)
+    # 마지막 실행의 그림만 모음 (위젯을 모두 바꾼 뒤 한 번 실행)
+    with capture_figures() as figures:
+        at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return figures
+
+
+def _write(fig_json, path, fmt):
+    import plotly.io as pio
+
+    fig = pio.from_json(fig_json)
+    if fmt == "html":
+        fig.write_html(path, include_plotlyjs=f"../{PLOTLY_JS}", full_html=True)
+    else:
+        fig.write_image(path, scale=2)
+
+
+def run_job(job, out_dir, formats, previous):
+    """작업 하나를 실행해 파일을 쓰고 {상대 경로: 그림 해시} 와 다시 쓴 파일 수를 반환합니다."""
+    figures = collect_figures(job)
+    page_dir = Path(out_dir) / job["page"]
+    page_dir.mkdir(parents=True, exist_ok=True)
+    files, written = {}, 0
+    for i, fig_json in enumerate(figures, 1):
+        digest = _digest(fig_json.encode())
+        for fmt in formats:
+            rel = f"{job['page']}/{job['name']}-{i}.{fmt}"
+            path = Path(out_dir) / rel
+            if previous.get(rel) != digest or not path.exists():
+                _write(fig_json, path, fmt)
+                written += 1
+            files[rel] = digest
+    return files, written
+
+
+def _write_plotly_js(out_dir):
+    import plotly
+    from plotly.offline import get_plotlyjs
+
+    path = out_dir / PLOTLY_JS
+    stamp = out_dir / f".{PLOTLY_JS}.version"
+    if path.exists() and stamp.exists() and stamp.read_text() == plotly.__version__:
+        return
+    path.write_text(get_plotlyjs(), encoding="utf-8")
+    stamp.write_text(plotly.__version__)
+
+
+def export(jobs, out_dir=DEFAULT_OUT, formats=("html",), workers=None, force=False):
+    """jobs 를 병렬로 내보내고 (실행한 작업 수, 건너뛴 작업 수, 실패 목록) 을 반환합니다."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / MANIFEST
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+    formats = tuple(formats)
+    if "png" in formats and kaleido is None:
+        logger.warning("kaleido 가 설치되어 있지 않아 PNG 는 건너뜁니다.")
+        formats = tuple(f for f in formats if f != "png")
+    if "html" in formats:
+        _write_plotly_js(out_dir)
+
+    token = code_token()
+    pending, skipped = [], 0
+    for job in jobs:
+        job_id = f"{job['page']}/{job['name']}"
+        key = job_key(job, token)
+        entry = manifest.get(job_id, {})
+        done = (
+            not force
+            and entry.get("key") == key
+            and entry.get("formats") == list(formats)
+            and all((out_dir / rel).exists() for rel in entry.get("files", {}))
+        )
+        if done:
+            skipped += 1
+        else:
+            pending.append((job_id, key, job, {} if force else entry.get("files", {})))
+
+    failures = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = {
+            pool.submit(run_job, job, str(out_dir), formats, previous): (job_id, key, job)
+            for job_id, key, job, previous in pending
+        }
+        for future in as_completed(futures):
+            job_id, key, job = futures[future]
+            try:
+                files, written = future.result()
+            except Exception as exc:
+                failures.append((job_id, exc))
+                print(f"실패 {job_id}: {exc}")
+                continue
+            for rel in set(manifest.get(job_id, {}).get("files", {})) - set(files):
+                (out_dir / rel).unlink(missing_ok=True)
+            manifest[job_id] = {
+                "key": key,
+                "page": job["page"],
+                "state": job["state"],
+                "formats": list(formats),
+                "files": files,
+            }
+            print(f"{job_id:32s} 그림 {len(files) // max(len(formats), 1):2d}개, 파일 {written}개 작성")
+            # 중단돼도 끝난 작업은 다음 실행에서 건너뛰도록 작업마다 기록
+            manifest_path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False))
+    return len(pending), skipped, failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="페이지 그림을 정적 HTML/PNG 로 일괄 내보내기")
+    parser.add_argument("jobs", nargs="?", type=Path, help="작업 목록 JSON (없으면 모든 페이지의 기본 상태)")
+    parser.add_argument("-o", "--out", type=Path, default=DEFAULT_OUT, help="출력 디렉터리")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--formats", default="html,png", help="쉼표로 구분한 출력 형식 (html, png)")
+    parser.add_argument("--force", action="store_true", help="해시와 관계없이 모두 다시 내보내기")
+    args = parser.parse_args(argv)
+
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        parser.error(f"알 수 없는 형식: {', '.join(sorted(unknown))}")
+    jobs = load_jobs(args.jobs) if args.jobs else default_jobs()
+
+    start = time.perf_counter()
+    ran, skipped, failures = export(jobs, args.out, formats, workers=args.workers, force=args.force)
+    print(f"실행 {ran}개, 건너뜀 {skipped}개, 실패 {len(failures)}개 ({time.perf_counter() - start:.1f}s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    # 워커가 작업 함수를 찾을 수 있도록 __main__ 이 아닌 common.export 모듈의 main 을 호출
+    # (AppTest 가 워커의 __main__ 을 페이지 스크립트로 바꾸므로)
+    sys.exit(importlib.import_module("common.export").main())
@@ -0,0 +1,120 @@
+"""세션 간 공유되는 Plotly 그림 LRU 캐시.
+
+키는 ``(페이지 id, 정규화된 위젯 값)`` 이고 값은 최적화까지 마친 그림 JSON 입니다
+(``common.render.show_cached_chart``). 같은 화면을 요청한 다른 세션은 pandas·Plotly 작업을
+반복하지 않고 저장된 JSON 을 그대로 출력합니다. 같은 키를 동시에 요청하면 한 세션만 만들고 나머지는 기다립니다.
+
+메모리 예산은 환경 변수 ``GAPMINDER_FIGURE_CACHE_MB`` (기본 64MB)로 조정합니다.
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import streamlit as st
+
+from common.tracing import count
+
+DEFAULT_BUDGET_MB = 64
+
+
+def _default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"위젯 값을 키로 쓸 수 없습니다: {value!r}")
+
+
+def normalize_state(state):
+    """위젯 값 dict → 순서·타입에 무관한 JSON 문자열 키."""
+    return json.dumps(state, sort_keys=True, default=_default, ensure_ascii=False)
+
+
+class PayloadCache:
+    """직렬화된 결과(str/bytes)를 바이트 예산 안에서 보관하는 스레드 안전 LRU.
+
+    같은 키를 동시에 요청하면 한 스레드만 만들고 나머지는 기다립니다.
+    """
+
+    name = "cache"  # 실행 추적 카운터 이름 접두어
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, make):
+        """key 의 결과를 반환하고, 없으면 make() 로 만들어 저장합니다."""
+        while True:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    count(f"{self.name}.hit")
+                    return self._entries[key]
+                waiter = self._pending.get(key)
+                if waiter is None:
+                    self._pending[key] = threading.Event()
+                    self.misses += 1
+                    count(f"{self.name}.miss")
+                    break
+            waiter.wait()
+        try:
+            payload = make()
+            with self._lock:
+                self._put(key, payload)
+            return payload
+        finally:
+            with self._lock:
+                self._pending.pop(key).set()
+
+    def _put(self, key, payload):
+        size = len(payload)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = payload
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, old = self._entries.popitem(last=False)
+            self.bytes -= len(old)
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+
+class FigureCache(PayloadCache):
+    name = "figcache"
+
+    def get_json(self, page, state, make):
+        """캐시된 그림 JSON 을 반환하고, 없으면 make() 로 만들어 저장합니다."""
+        return self.get((page, normalize_state(state)), make)
+
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache():
+    """프로세스 전체가 공유하는 그림 캐시."""
+    budget_mb = float(os.environ.get("GAPMINDER_FIGURE_CACHE_MB", DEFAULT_BUDGET_MB))
+    return FigureCache(int(budget_mb * 1024 * 1024))
@@ -0,0 +1,32 @@
+"""애니메이션 프레임 데이터 (연도 범위 + 간격으로 솎아낸 프레임).
+
+전체 300여 개 연도를 한 번에 보내는 대신, 선택한 범위에서 ``stride`` 년 간격의
+프레임만 만들어 페이로드를 줄입니다. 마지막 연도는 항상 포함됩니다.
+"""
+import numpy as np
+import pandas as pd
+
+from common.cube import load_cube
+
+
+def frame_years(start, end, stride=1):
+    """start~end 사이 stride 간격 연도 (end 포함)."""
+    years = np.arange(int(start), int(end) + 1, max(int(stride), 1))
+    if years[-1] != int(end):
+        years = np.append(years, int(end))
+    return years
+
+
+def animation_frame_data(metrics, start, end, stride=1):
+    """선택 프레임의 (year, country, metrics...) 긴 형식 DataFrame. 결측 행은 제외합니다."""
+    cube = load_cube()
+    years = frame_years(start, end, stride)
+    yi = years - cube.year_min
+    n = len(cube.countries)
+    out = pd.DataFrame({
+        "year": np.repeat(years, n),
+        "country": np.tile(cube.countries.to_numpy(), len(years)),
+    })
+    for metric in metrics:
+        out[metric] = cube.get_matrix(metric)[yi].ravel()
+    return out.dropna(subset=list(metrics)).reset_index(drop=True)
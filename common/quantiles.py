@@ -0,0 +1,136 @@
+"""(연도, 소득그룹)별 분포 요약: 사분위수·수염·이상치, 고정 격자 KDE, 추세 요약.
+
+박스 플롯(페이지 04)과 추세 밴드(페이지 07)를 원본 행 대신 미리 계산된 요약값으로
+그리기 위한 모듈입니다. 전체 값을 (연도, 그룹) 순으로 한 번 정렬한 뒤, 각 구간의 위치
+계산만으로 분위수(plotly 기본값과 같은 linear 보간)를 구합니다.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from common import shared
+from common.data import load_data
+
+INCOME_ORDER = ["low_income", "lower_middle_income", "upper_middle_income", "high_income"]
+BOX_STATS = ["q1", "median", "q3", "mean", "lowerfence", "upperfence"]
+
+
+class BoxSummaries:
+    def __init__(self, df, metric="gdp_pcap", group="income_groups", weight="pop", grid_size=64):
+        self.year_min = int(df["year"].min())
+        self.years = np.arange(self.year_min, int(df["year"].max()) + 1)
+        cats = df[group].cat.categories
+        self.groups = [g for g in INCOME_ORDER if g in cats] + [g for g in cats if g not in INCOME_ORDER]
+        remap = np.array([self.groups.index(g) for g in cats])
+        n_groups = len(self.groups)
+
+        codes = df[group].cat.codes.to_numpy()
+        values = df[metric].to_numpy().astype(np.float64)
+        ok = (codes >= 0) & ~np.isnan(values)
+        cell = (df["year"].to_numpy()[ok].astype(np.int64) - self.year_min) * n_groups + remap[codes[ok]]
+        values = values[ok]
+        countries = df["country"].to_numpy()[ok]
+        weights = df[weight].to_numpy().astype(np.float64)[ok]
+
+        order = np.lexsort((values, cell))
+        self._sorted = values[order]
+        self._cell = cell[order]
+        self._countries = countries[order]
+        n_cells = len(self.years) * n_groups
+        self.counts = np.bincount(cell, minlength=n_cells)
+        self.starts = np.concatenate([[0], np.cumsum(self.counts)[:-1]])
+
+        q1, med, q3 = (self._quantile(q) for q in (0.25, 0.5, 0.75))
+        iqr = q3 - q1
+        lo_f, hi_f = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+        below = self._sorted < lo_f[self._cell]
+        above = self._sorted > hi_f[self._cell]
+        n_below = np.bincount(self._cell[below], minlength=n_cells)
+        n_above = np.bincount(self._cell[above], minlength=n_cells)
+        has = self.counts > 0
+        last = np.maximum(self.starts + self.counts - 1, 0)
+        self.stats = {
+            "q1": q1, "median": med, "q3": q3,
+            "mean": np.bincount(self._cell, self._sorted, n_cells) / np.where(has, self.counts, np.nan),
+            "lowerfence": np.where(has, self._sorted[np.minimum(self.starts + n_below, last)], np.nan),
+            "upperfence": np.where(has, self._sorted[np.maximum(last - n_above, 0)], np.nan),
+        }
+        self._outlier = below | above
+
+        # 추세 요약: 평균·인구 가중 평균·중앙값과 p10/p90 밴드 (결측 인구는 가중 평균에서 제외)
+        w_ok = ~np.isnan(weights)
+        w_sum = np.bincount(cell[w_ok], weights[w_ok], n_cells)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            w_mean = np.bincount(cell[w_ok], values[w_ok] * weights[w_ok], n_cells) / w_sum
+        self.stats.update({"p10": self._quantile(0.1), "p90": self._quantile(0.9), "w_mean": w_mean})
+        self.trends = self._table(np.arange(n_cells), ["mean", "w_mean", "median", "p10", "p90"])
+
+        # KDE 격자: 로그 스케일의 고정 격자
+        logs = np.log10(self._sorted)
+        self.grid = np.logspace(logs.min(), logs.max(), grid_size)
+        self._log_sorted = logs
+
+    def _quantile(self, q):
+        pos = self.starts + q * np.maximum(self.counts - 1, 0)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.minimum(lo + 1, np.maximum(self.starts + self.counts - 1, 0))
+        frac = pos - lo
+        s = self._sorted
+        lo_c, hi_c = np.minimum(lo, len(s) - 1), np.minimum(hi, len(s) - 1)
+        out = s[lo_c] + frac * (s[hi_c] - s[lo_c])
+        return np.where(self.counts > 0, out, np.nan)
+
+    def _cells(self, years):
+        yi = np.asarray(years, dtype=np.int64) - self.year_min
+        return (yi[:, None] * len(self.groups) + np.arange(len(self.groups))).ravel()
+
+    def _table(self, cells, columns):
+        out = pd.DataFrame({
+            "year": cells // len(self.groups) + self.year_min,
+            "group": np.asarray(self.groups)[cells % len(self.groups)],
+            "n": self.counts[cells],
+        })
+        for name in columns:
+            out[name] = self.stats[name][cells]
+        return out[out["n"] > 0].reset_index(drop=True)
+
+    def summary(self, years):
+        """선택 연도의 (year, group, n, q1, median, q3, mean, lowerfence, upperfence) 표."""
+        return self._table(self._cells(years), BOX_STATS)
+
+    def outliers(self, years):
+        """선택 연도의 이상치 행 (year, group, country, value)."""
+        cells = self._cells(years)
+        mask = self._outlier & np.isin(self._cell, cells)
+        cell = self._cell[mask]
+        return pd.DataFrame({
+            "year": cell // len(self.groups) + self.year_min,
+            "group": np.asarray(self.groups)[cell % len(self.groups)],
+            "country": self._countries[mask],
+            "value": self._sorted[mask],
+        })
+
+    def density(self, years):
+        """고정 격자 위 가우시안 KDE (로그 공간, Scott 대역폭) → 긴 형식 DataFrame."""
+        grid = np.log10(self.grid)
+        frames = []
+        for cell in self._cells(years):
+            n = self.counts[cell]
+            if n < 2:
+                continue
+            x = self._log_sorted[self.starts[cell]:self.starts[cell] + n]
+            bw = max(x.std(ddof=1), 1e-3) * n ** (-1 / 5)
+            dens = np.exp(-0.5 * ((grid[:, None] - x[None, :]) / bw) ** 2).sum(axis=1) / (n * bw * np.sqrt(2 * np.pi))
+            frames.append(pd.DataFrame({
+                "year": cell // len(self.groups) + self.year_min,
+                "group": self.groups[cell % len(self.groups)],
+                "value": self.grid,
+                "density": dens,
+            }))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["year", "group", "value", "density"])
+
+
+@st.cache_resource(show_spinner=False)
+@shared.resource("box_summaries")
+def load_box_summaries():
+    return BoxSummaries(load_data())
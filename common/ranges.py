@@ -0,0 +1,107 @@
+"""연도 구간 통계를 위한 누적합(prefix-sum) 인덱스.
+
+(지표, 집계 수준, 가중 여부)마다 그룹 × 연도 합계·개수의 누적합을 저장해 두므로,
+임의의 ``[start_year, end_year]`` 구간 평균을 누적합 두 칸의 차로 O(1) 에 구합니다.
+집계 수준은 전세계(``world``), ``world_4region``, ``income_groups`` 이며,
+가중 평균은 인구(``pop``) 가중입니다.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from common import shared
+from common.data import load_data
+
+LEVELS = ("world", "world_4region", "income_groups")
+METRICS = ("gdp_pcap", "lex")
+
+
+def _prefix(a):
+    """마지막 축 앞에 0 을 붙인 누적합: out[..., j] = a[..., :j].sum(-1)"""
+    out = np.zeros(a.shape[:-1] + (a.shape[-1] + 1,))
+    np.cumsum(a, axis=-1, out=out[..., 1:])
+    return out
+
+
+class RangeAggregates:
+    def __init__(self, df, metrics=METRICS, levels=LEVELS, weight="pop"):
+        self.year_min = int(df["year"].min())
+        self.years = np.arange(self.year_min, int(df["year"].max()) + 1)
+        n_years = len(self.years)
+        year_idx = df["year"].to_numpy().astype(np.int64) - self.year_min
+        w = df[weight].to_numpy().astype(np.float64)
+
+        self._groups = {}
+        self._tables = {}
+        for level in levels:
+            if level == "world":
+                groups = pd.Index(["world"], name=level)
+                codes = np.zeros(len(df), dtype=np.int64)
+            else:
+                groups = pd.Index(df[level].cat.categories, name=level)
+                codes = df[level].cat.codes.to_numpy().astype(np.int64)
+            self._groups[level] = groups
+            cells = len(groups) * n_years
+            for metric in metrics:
+                x = df[metric].to_numpy().astype(np.float64)
+                ok = (codes >= 0) & ~np.isnan(x)
+                cell = codes[ok] * n_years + year_idx[ok]
+                xw, ww = x[ok], w[ok]
+                wok = ~np.isnan(ww)
+                for weighted in (False, True):
+                    if weighted:
+                        sums = np.bincount(cell[wok], xw[wok] * ww[wok], cells)
+                        counts = np.bincount(cell[wok], ww[wok], cells)
+                    else:
+                        sums = np.bincount(cell, xw, cells)
+                        counts = np.bincount(cell, minlength=cells).astype(np.float64)
+                    sums = sums.reshape(len(groups), n_years)
+                    counts = counts.reshape(len(groups), n_years)
+                    with np.errstate(invalid="ignore", divide="ignore"):
+                        means = sums / counts
+                    has = counts > 0
+                    self._tables[metric, level, weighted] = {
+                        "means": means,
+                        "sum": _prefix(sums),
+                        "count": _prefix(counts),
+                        "mean_sum": _prefix(np.where(has, means, 0.0)),
+                        "mean_n": _prefix(has.astype(np.float64)),
+                    }
+
+    def groups(self, level):
+        return self._groups[level]
+
+    def _window(self, start, end):
+        lo = max(int(start) - self.year_min, 0)
+        hi = min(int(end) - self.year_min + 1, len(self.years))
+        return lo, max(hi, lo)
+
+    def yearly_mean(self, metric, level="world", weighted=False, start=None, end=None):
+        """연도별 평균 (index=year, columns=그룹)."""
+        lo, hi = self._window(self.years[0] if start is None else start,
+                              self.years[-1] if end is None else end)
+        means = self._tables[metric, level, weighted]["means"][:, lo:hi]
+        return pd.DataFrame(means.T, index=pd.Index(self.years[lo:hi], name="year"),
+                            columns=self.groups(level))
+
+    def window_mean(self, metric, start, end, level="world", weighted=False):
+        """구간 내 연도별 평균들의 평균 (그룹별 Series)."""
+        t = self._tables[metric, level, weighted]
+        lo, hi = self._window(start, end)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out = (t["mean_sum"][:, hi] - t["mean_sum"][:, lo]) / (t["mean_n"][:, hi] - t["mean_n"][:, lo])
+        return pd.Series(out, index=self.groups(level), name=metric)
+
+    def pooled_mean(self, metric, start, end, level="world", weighted=False):
+        """구간 내 모든 국가-연도 관측치를 합친 평균 (그룹별 Series)."""
+        t = self._tables[metric, level, weighted]
+        lo, hi = self._window(start, end)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out = (t["sum"][:, hi] - t["sum"][:, lo]) / (t["count"][:, hi] - t["count"][:, lo])
+        return pd.Series(out, index=self.groups(level), name=metric)
+
+
+@st.cache_resource(show_spinner=False)
+@shared.resource("range_aggregates")
+def load_range_aggregates():
+    return RangeAggregates(load_data())
@@ -0,0 +1,77 @@
+"""국가별 변화량 상위/하위 K 랭킹.
+
+``np.argpartition`` 한 번으로 양 끝(상위 k, 하위 k)을 함께 뽑고, 뽑힌 k 개만 정렬합니다.
+연평균 성장률(CAGR)은 미리 계산한 국가별 로그값 행렬에서 두 연도 행의 차 한 번으로 구합니다.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from common import shared
+from common.cube import load_cube
+
+# change: 절대 변화량, pct_change: 변화율(%), cagr: 연평균 성장률(%)
+KINDS = ("change", "pct_change", "cagr")
+
+
+def top_bottom_k(values, k):
+    """NaN 을 제외한 상위 k, 하위 k 위치를 (내림차순, 오름차순) 으로 반환합니다."""
+    idx = np.flatnonzero(~np.isnan(values))
+    v = values[idx]
+    n = len(v)
+    k = min(k, n)
+    if k == 0:
+        return idx[:0], idx[:0]
+    if 2 * k >= n:
+        order = np.argsort(v, kind="stable")
+        return idx[order[::-1][:k]], idx[order[:k]]
+    part = np.argpartition(v, [k - 1, n - k])
+    bottom, top = part[:k], part[n - k:]
+    bottom = bottom[np.argsort(v[bottom], kind="stable")]
+    top = top[np.argsort(-v[top], kind="stable")]
+    return idx[top], idx[bottom]
+
+
+class GrowthEngine:
+    def __init__(self, cube):
+        self.cube = cube
+        values = cube.values.astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.log_values = np.log(np.where(values > 0, values, np.nan))
+
+    def change(self, metric, y1, y2, kind="pct_change"):
+        """국가별 y1 → y2 변화 벡터 (길이 = 국가 수)."""
+        cube = self.cube
+        if kind == "cagr":
+            m = cube.metric_index(metric)
+            span = int(y2) - int(y1)
+            if span == 0:
+                return np.full(len(cube.countries), np.nan)
+            logs = self.log_values[m]
+            return np.expm1((logs[cube.year_index(y2)] - logs[cube.year_index(y1)]) / span) * 100
+        start, end = cube.get_pair(metric, y1, y2)
+        start, end = start.astype(np.float64), end.astype(np.float64)
+        if kind == "change":
+            return end - start
+        if kind == "pct_change":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return (end - start) / start * 100
+        raise ValueError(f"unknown kind: {kind!r}")
+
+    def rankings(self, metric, y1, y2, kinds=KINDS, k=10):
+        """kind 별 (상위 k, 하위 k) DataFrame[country, <kind>] 쌍을 담은 dict."""
+        out = {}
+        for kind in kinds:
+            values = self.change(metric, y1, y2, kind)
+            top, bottom = top_bottom_k(values, k)
+            out[kind] = tuple(
+                pd.DataFrame({"country": self.cube.countries[i], kind: values[i]})
+                for i in (top, bottom)
+            )
+        return out
+
+
+@st.cache_resource(show_spinner=False)
+@shared.resource("growth")
+def load_growth_engine():
+    return GrowthEngine(load_cube())
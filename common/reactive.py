@@ -0,0 +1,27 @@
+"""세션 단위 파생 데이터 메모이제이션.
+
+``derived(name, deps, compute)`` 는 의존 값(deps)이 직전 실행과 같으면 세션에 저장된
+결과를 그대로 돌려주고, 달라졌을 때만 compute() 를 다시 실행합니다.
+``st.fragment`` 와 함께 쓰면 위젯 하나가 바뀌었을 때 그 위젯에 의존하는 계산과
+그림만 다시 만들어집니다.
+"""
+import streamlit as st
+
+from common.figcache import normalize_state
+from common.tracing import count, span
+
+_STORE_KEY = "_derived"
+
+
+def derived(name, deps, compute):
+    store = st.session_state.setdefault(_STORE_KEY, {})
+    token = normalize_state(deps)
+    cached = store.get(name)
+    if cached is not None and cached[0] == token:
+        count("derived.hit")
+        return cached[1]
+    count("derived.miss")
+    with span("aggregate", name):
+        value = compute()
+    store[name] = (token, value)
+    return value
@@ -0,0 +1,252 @@
+"""그림 렌더링 도우미: 점 개수에 따라 WebGL 전환, 긴 선 LTTB 다운샘플링.
+
+모든 페이지는 ``st.plotly_chart`` 대신 ``show_chart`` 를 사용합니다.
+
+- 전체 점 개수(애니메이션이면 프레임당 최대값)가 임계값을 넘으면 ``scatter`` 트레이스를
+  ``scattergl`` 로 바꿉니다. 채우기·누적·``offsetgroup`` 정렬을 쓰는 트레이스와, 다음 트레이스가
+  ``tonexty`` 로 채우는 기준 트레이스는 SVG 로 둡니다 (두 트레이스가 같은 렌더러여야 밴드가 그려짐).
+- 페이지가 ``drop_customdata=True`` 로 customdata 가 프레임·축으로 이미 보이는 값이라고
+  알려 주면, 전환한 트레이스에서 customdata 와 호버의 ``%{customdata[i]}`` 항목을 뺍니다.
+- 선 트레이스가 ``max_line_points`` 보다 길면 LTTB 로 줄입니다.
+- ``full_fidelity=True`` 또는 환경 변수 ``GAPMINDER_FULL_FIDELITY=1`` 이면 원본 그대로 그립니다.
+
+WebGL 전환은 이 모듈이 결정하므로 페이지의 ``px.line``/``px.scatter`` 는 ``render_mode='svg'`` 로
+만듭니다. 입력 그림은 바꾸지 않으며, 바꿀 트레이스가 있을 때만 복사합니다.
+
+``show_cached_chart`` 는 최적화까지 마친 그림을 세션 간 공유 캐시(``common.figcache``)에 두고,
+캐시 적중 시 Figure 를 다시 만들지 않고 저장된 dict 를 그대로 ``st.plotly_chart`` 에 넘깁니다.
+
+임계값은 환경 변수 ``GAPMINDER_WEBGL_THRESHOLD``, ``GAPMINDER_MAX_LINE_POINTS`` 로 조정합니다.
+"""
+import base64
+import json
+import logging
+import os
+import re
+from contextlib import contextmanager
+
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+from common.figcache import get_figure_cache
+from common.startup import mark
+from common.tracing import span
+
+logger = logging.getLogger("gapminder.render")
+
+WEBGL_THRESHOLD = int(os.environ.get("GAPMINDER_WEBGL_THRESHOLD", 2000))
+MAX_LINE_POINTS = int(os.environ.get("GAPMINDER_MAX_LINE_POINTS", 1000))
+
+_captured = None
+
+# 호버 템플릿의 customdata 항목과 그 앞의 줄바꿈·라벨 (예: "<br>year=%{customdata[0]}")
+_CUSTOMDATA_TOKEN = re.compile(r"(?:<br>)?[^<>%{}]*%\{customdata\[\d+\][^}]*\}")
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets 다운샘플링. 선택된 점의 위치 배열을 반환합니다."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_lo, nxt_hi = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        cx = x[nxt_lo:nxt_hi].mean() if nxt_hi > nxt_lo else x[-1]
+        cy = y[nxt_lo:nxt_hi].mean() if nxt_hi > nxt_lo else y[-1]
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.nanargmax(area)) if hi > lo and not np.all(np.isnan(area)) else lo
+        keep[i + 1] = a
+    return keep
+
+
+def _array(value):
+    """트레이스 배열 속성 → numpy 배열 (JSON 에서 복원된 typed array ``{dtype, bdata}`` 포함)."""
+    if isinstance(value, dict) and "bdata" in value:
+        arr = np.frombuffer(base64.b64decode(value["bdata"]), dtype=value["dtype"])
+        if value.get("shape"):
+            arr = arr.reshape([int(s) for s in str(value["shape"]).split(",")])
+        return arr
+    return np.asarray(value)
+
+
+def _points(traces):
+    return sum(len(_array(t.x)) for t in traces if getattr(t, "x", None) is not None)
+
+
+def count_points(fig):
+    """표시 점 개수 (애니메이션이면 프레임 중 최대)."""
+    counts = [_points(fig.data)] + [_points(f.data) for f in fig.frames]
+    return max(counts)
+
+
+def _gl_compatible(trace):
+    # scattergl 은 막대·박스와의 offsetgroup 정렬을 지원하지 않음
+    return (
+        trace.type == "scatter"
+        and not trace.stackgroup
+        and trace.fill in (None, "none")
+        and not trace.offsetgroup
+    )
+
+
+def _gl_mask(traces):
+    """트레이스별 WebGL 전환 여부. tonext* 채우기의 기준 트레이스는 채우는 쪽과 같이 SVG 로 둡니다."""
+    traces = list(traces)
+    fills = [t.fill if t.type == "scatter" else None for t in traces[1:]] + [None]
+    return [_gl_compatible(t) and not (fill or "").startswith("tonext") for t, fill in zip(traces, fills)]
+
+
+def _convert(traces, drop_customdata):
+    return [_to_webgl(t, drop_customdata) if gl else t for t, gl in zip(traces, _gl_mask(traces))]
+
+
+def _to_webgl(trace, drop_customdata=False):
+    props = trace.to_plotly_json()
+    props.pop("type", None)
+    if drop_customdata and props.pop("customdata", None) is not None and props.get("hovertemplate"):
+        props["hovertemplate"] = _CUSTOMDATA_TOKEN.sub("", props["hovertemplate"])
+    return go.Scattergl(props, skip_invalid=True)
+
+
+def _needs_downsample(trace, max_points):
+    if trace.type not in ("scatter", "scattergl") or "lines" not in (trace.mode or "lines"):
+        return False
+    if trace.x is None or trace.y is None:
+        return False
+    return len(_array(trace.x)) > max_points
+
+
+def _downsample(trace, max_points):
+    if not _needs_downsample(trace, max_points):
+        return trace
+    x_raw, y = _array(trace.x), _array(trace.y)
+    try:
+        x = x_raw.astype(np.float64)
+    except (TypeError, ValueError):
+        x = np.arange(len(x_raw), dtype=np.float64)
+    keep = lttb(x, y, max_points)
+    updates = {"x": x_raw[keep], "y": y[keep]}
+    for attr in ("customdata", "hovertext", "text"):
+        value = getattr(trace, attr, None)
+        if value is None or isinstance(value, str):
+            continue
+        value = _array(value)
+        if len(value) == len(x_raw):
+            updates[attr] = value[keep]
+    trace.update(updates)
+    return trace
+
+
+def optimize_figure(fig, full_fidelity=None, webgl_threshold=None, max_line_points=None,
+                    drop_customdata=False):
+    """최적화된 그림과 보고서 (fig, report) 를 반환합니다. 바꿀 것이 있으면 복사본에서 작업합니다."""
+    if full_fidelity is None:
+        full_fidelity = os.environ.get("GAPMINDER_FULL_FIDELITY") == "1"
+    webgl_threshold = WEBGL_THRESHOLD if webgl_threshold is None else webgl_threshold
+    max_line_points = MAX_LINE_POINTS if max_line_points is None else max_line_points
+
+    report = {"backend": "svg", "points": count_points(fig), "traces": len(fig.data)}
+    if full_fidelity:
+        report["points_rendered"] = report["points"]
+        return fig, report
+
+    webgl = report["points"] > webgl_threshold and any(_gl_mask(fig.data))
+    traces = list(fig.data) + [t for frame in fig.frames for t in frame.data]
+    if webgl or any(_needs_downsample(t, max_line_points) for t in traces):
+        # 입력 그림은 그대로 두고, 바꿀 트레이스가 있을 때만 복사본을 바꿈
+        fig = go.Figure(fig)
+        for trace in fig.data:
+            _downsample(trace, max_line_points)
+        for frame in fig.frames:
+            for trace in frame.data:
+                _downsample(trace, max_line_points)
+        if webgl:
+            for frame in fig.frames:
+                frame.data = _convert(frame.data, drop_customdata)
+            # Figure.data 는 다른 타입의 트레이스로 교체할 수 없으므로 새 Figure 로 만듭니다.
+            fig = go.Figure(
+                data=_convert(fig.data, drop_customdata),
+                layout=fig.layout,
+                frames=fig.frames,
+            )
+            report["backend"] = "webgl"
+    report["points_rendered"] = count_points(fig)
+    return fig, report
+
+
+@contextmanager
+def capture_figures():
+    """블록 안에서 show_chart 에 전달된 원본 그림을 JSON 으로 모읍니다 (오프라인 내보내기용)."""
+    global _captured
+    _captured = captured = []
+    try:
+        yield captured
+    finally:
+        _captured = None
+
+# 호버 템플릿의 customdata 항목과 그 앞의 줄바꿈·라벨 (예: "<br>year=%{customdata[0]}")
+_CUSTOMDATA_TOKEN = re.compile(r"(?:<br>)?[^<>%{}]*%\{customdata\[\d+\][^}]*\}")
+
+
+class _PreparedFigure(go.Figure):
+    """이미 최적화·직렬화된 그림 dict 를 검증 없이 st.plotly_chart 에 넘기는 껍데기.
+
+    st.plotly_chart 는 dict 를 받으면 Figure 로 다시 검증하지만, Figure 에는 ``to_dict()`` 만
+    호출하므로 캐시의 dict 를 그대로 돌려줍니다.
+    """
+
+    def __init__(self, fig_dict):
+        super().__init__()
+        self._fig_dict = fig_dict
+
+    def to_dict(self):
+        return self._fig_dict
+
+
+def _plotly_chart(fig, page, report, **kwargs):
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps({"event": "render", "page": page, **report}, ensure_ascii=False))
+    kwargs.setdefault("use_container_width", True)
+    with span("serialize", "plotly_chart", backend=report["backend"], points=report["points_rendered"]):
+        st.plotly_chart(fig, **kwargs)
+    mark("first_chart")
+    return report
+
+
+def show_chart(fig, page=None, full_fidelity=None, drop_customdata=False, **kwargs):
+    """최적화 후 st.plotly_chart 로 출력하고 렌더 보고서를 반환합니다."""
+    if _captured is not None:
+        _captured.append(fig.to_json())
+    with span("figure", "optimize"):
+        fig, report = optimize_figure(fig, full_fidelity=full_fidelity, drop_customdata=drop_customdata)
+    return _plotly_chart(fig, page, report, **kwargs)
+
+
+def show_cached_chart(page, state, build, full_fidelity=None, drop_customdata=False, **kwargs):
+    """(page, state) 의 최적화된 그림을 공유 캐시에서 꺼내 출력합니다 (없을 때만 build())."""
+    if _captured is not None:
+        # 내보내기는 최적화 전 원본 그림을 모으므로 캐시를 거치지 않음
+        return show_chart(build(), page=page, full_fidelity=full_fidelity,
+                          drop_customdata=drop_customdata, **kwargs)
+    if full_fidelity is None:
+        full_fidelity = os.environ.get("GAPMINDER_FULL_FIDELITY") == "1"
+
+    def make():
+        with span("figure", f"build:{page}"):
+            fig = build()
+        with span("figure", "optimize"):
+            fig, report = optimize_figure(fig, full_fidelity=full_fidelity, drop_customdata=drop_customdata)
+        with span("serialize", "to_json"):
+            return f'{{"report": {json.dumps(report)}, "figure": {fig.to_json()}}}'
+
+    payload = get_figure_cache().get_json(page, {**state, "full_fidelity": full_fidelity}, make)
+    with span("serialize", "from_json", bytes=len(payload)):
+        entry = json.loads(payload)
+    return _plotly_chart(_PreparedFigure(entry["figure"]), page, entry["report"], **kwargs)
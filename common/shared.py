@@ -0,0 +1,192 @@
+"""여러 Streamlit 서버 프로세스가 파생 인덱스를 공유 메모리로 함께 쓰는 모드.
+
+데이터셋 자체는 이미 메모리 매핑된 Arrow 캐시(``common.cache``)라 OS 페이지 캐시를 통해
+프로세스 간에 공유됩니다. 이 모듈은 그 위에서 만든 파생 객체(지표 큐브, 기준값 인덱스,
+누적합 등)도 같은 방식으로 공유합니다.
+
+- 로더 프로세스가 ``python -m common.shared publish`` 로 등록된 파생 객체를 모두 만든 뒤,
+  큰 numpy 배열은 ``.npy`` 파일로, 나머지 뼈대는 pickle 하나로 ``data/cache/shared/`` 에 씁니다.
+- ``GAPMINDER_SHARED=1`` 로 실행한 워커는 ``@shared.resource(name)`` 로 등록된 로더에서
+  직접 만들지 않고 번들을 붙입니다. 배열은 ``np.load(mmap_mode="r")`` 로 매핑되므로
+  복사 없이 읽기 전용이고, 물리 메모리는 워커 수가 아니라 데이터셋 수에 비례합니다.
+
+번들 디렉터리 이름은 원본 캐시 메타(내용 해시 포함)와 파생 객체 모듈 소스의 해시이므로,
+데이터나 코드가 바뀌면 새 번들을 발행할 때까지 워커는 경고를 남기고 직접 만듭니다.
+"""
+import argparse
+import functools
+import hashlib
+import importlib
+import importlib.util
+import logging
+import os
+import pickle
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+from common.cache import CACHE_DIR
+
+logger = logging.getLogger("gapminder.shared")
+
+SHARED_DIR = CACHE_DIR / "shared"
+BUNDLE_FILE = "bundle.pkl"
+MIN_SHARED_BYTES = 4096
+
+# 공유 대상 로더가 정의된 모듈 (publish 시 import 하여 등록)
+MODULES = [
+    "common.cube",
+    "common.entities",
+    "common.quantiles",
+    "common.ranges",
+    "common.ranking",
+    "common.stats",
+    "common.thresholds",
+]
+
+_loaders = {}
+
+
+def enabled():
+    return os.environ.get("GAPMINDER_SHARED") == "1"
+
+
+def bundle_token():
+    """원본 캐시 메타와 파생 객체 모듈 소스로 만든 번들 식별자. 캐시가 낡았으면 None."""
+    from common import cache, data
+
+    h = hashlib.sha256()
+    for src, (_, schema) in data.SOURCES.items():
+        if not cache.is_fresh(src, schema):
+            return None
+        h.update((CACHE_DIR / f"{Path(src).stem}.json").read_bytes())
+    for name in MODULES:
+        h.update(Path(importlib.util.find_spec(name).origin).read_bytes())
+    return h.hexdigest()[:16]
+
+
+class _Pickler(pickle.Pickler):
+    """큰 숫자 배열은 pickle 대신 .npy 파일로 빼내고 파일 이름만 기록합니다."""
+
+    def __init__(self, file, out_dir):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.out_dir = out_dir
+        self.saved = {}
+
+    def persistent_id(self, obj):
+        if type(obj) is not np.ndarray or obj.dtype.hasobject or obj.nbytes < MIN_SHARED_BYTES:
+            return None
+        key = self.saved.get(id(obj))
+        if key is None:
+            key = f"a{len(self.saved)}.npy"
+            np.save(self.out_dir / key, np.ascontiguousarray(obj))
+            # id 재사용을 막기 위해 원본 객체도 함께 보관
+            self.saved[id(obj)] = key
+            self.saved[key] = obj
+        return key
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file, bundle_dir):
+        super().__init__(file)
+        self.bundle_dir = bundle_dir
+
+    def persistent_load(self, key):
+        return np.load(self.bundle_dir / key, mmap_mode="r")
+
+
+def publish(objects, token=None):
+    """objects(dict) 를 번들로 써서 워커가 붙일 수 있게 합니다. 번들 디렉터리를 반환합니다."""
+    token = token or bundle_token()
+    if token is None:
+        raise RuntimeError("데이터 캐시가 최신이 아닙니다. 먼저 python -m common.cache 를 실행하세요.")
+    SHARED_DIR.mkdir(parents=True, exist_ok=True)
+    final = SHARED_DIR / token
+    tmp = SHARED_DIR / f".{token}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir()
+    try:
+        with open(tmp / BUNDLE_FILE, "wb") as f:
+            _Pickler(f, tmp).dump(objects)
+        if final.exists():
+            shutil.rmtree(final)
+        os.rename(tmp, final)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    # 이전 번들 정리 (이미 매핑한 워커는 파일이 지워져도 계속 읽을 수 있음)
+    for old in SHARED_DIR.iterdir():
+        if old.is_dir() and old.name != token and not old.name.startswith("."):
+            shutil.rmtree(old, ignore_errors=True)
+    return final
+
+
+@functools.lru_cache(maxsize=None)
+def _attach(token):
+    if token is None:
+        return None
+    bundle_dir = SHARED_DIR / token
+    try:
+        with open(bundle_dir / BUNDLE_FILE, "rb") as f:
+            return _Unpickler(f, bundle_dir).load()
+    except FileNotFoundError:
+        return None
+
+
+def attach():
+    """현재 데이터·코드에 맞는 번들(dict)을 붙입니다. 없으면 None."""
+    return _attach(bundle_token())
+
+
+def resource(name):
+    """로더 데코레이터: 공유 모드면 번들의 name 객체를, 아니면 로더 결과를 반환합니다.
+
+    ``@st.cache_resource`` 아래에 둡니다 (프로세스당 한 번만 붙이거나 만들도록).
+    """
+    def decorator(loader):
+        @functools.wraps(loader)
+        def wrapper():
+            if enabled():
+                bundle = attach()
+                if bundle is not None and name in bundle:
+                    return bundle[name]
+                logger.warning("공유 번들에 %s 가 없어 이 프로세스에서 직접 만듭니다.", name)
+            return loader()
+        _loaders[name] = (loader.__module__, loader.__name__)
+        return wrapper
+    return decorator
+
+
+def build_all():
+    """등록된 모든 로더를 이 프로세스에서 실행해 {name: 객체} 로 반환합니다.
+
+    캐시된 공개 로더를 호출하므로 객체끼리 공유하는 하위 객체(예: 큐브)는 한 번만 저장됩니다.
+    """
+    for module in MODULES:
+        importlib.import_module(module)
+    return {
+        name: getattr(importlib.import_module(module), func)()
+        for name, (module, func) in _loaders.items()
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="파생 인덱스를 공유 메모리 번들로 발행")
+    parser.add_argument("command", choices=["publish", "status"])
+    args = parser.parse_args(argv)
+    if args.command == "status":
+        token = bundle_token()
+        path = token and SHARED_DIR / token
+        print(f"{path} {'있음' if path and (path / BUNDLE_FILE).exists() else '없음'}")
+        return
+    # 발행 프로세스는 번들을 붙이지 않고 직접 만듭니다.
+    os.environ.pop("GAPMINDER_SHARED", None)
+    objects = build_all()
+    path = publish(objects)
+    size = sum(p.stat().st_size for p in path.iterdir())
+    print(f"발행 완료: {path} ({', '.join(objects)}; {size / 1024 / 1024:.1f} MB)")
+
+
+if __name__ == "__main__":
+    # -m 실행 시 이 파일은 __main__ 이므로, 로더가 등록되는 common.shared 모듈의 main 을 호출
+    importlib.import_module("common.shared").main()
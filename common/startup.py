@@ -0,0 +1,135 @@
+"""콜드 스타트 타이머와 백그라운드 워밍업.
+
+서버 재시작 후 첫 요청에서 무거운 모듈 import 와 데이터 로드를 기다리지 않도록,
+페이지는 제목 등 뼈대를 먼저 그린 뒤 ``boot()`` 를 호출합니다. ``boot()`` 는 프로세스당
+한 번 스레드 풀에 워밍업 작업(공유 데이터셋 로드, 각 페이지 기본 상태의 집계 계산)을
+넣고 즉시 반환합니다.
+
+이 모듈은 pandas·plotly 를 import 하지 않아야 합니다 (뼈대 렌더링을 막지 않도록).
+
+시작 타이머는 이 모듈이 처음 import 된 시점(재시작 후 첫 요청)부터
+``first_paint``(첫 뼈대), ``first_chart``(첫 차트), 워밍업 작업별 완료 시각을 기록하고
+JSON 로그(``gapminder.startup``)로 남깁니다. 로그 출력은 환경 변수 ``GAPMINDER_TRACE_LOG`` 로
+켭니다 (``common.tracing`` 참고).
+"""
+import importlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from common.tracing import begin
+
+logger = logging.getLogger("gapminder.startup")
+
+_T0 = time.perf_counter()
+_marks = {}
+_lock = threading.Lock()
+
+HEAVY_MODULES = ["numpy", "pandas", "plotly.express", "plotly.graph_objects"]
+
+
+def mark(name):
+    """시작 후 경과 시간을 name 으로 한 번만 기록합니다."""
+    with _lock:
+        if name in _marks:
+            return
+        _marks[name] = round(time.perf_counter() - _T0, 4)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps({"event": "startup", "mark": name, "seconds": _marks[name]}))
+
+
+def startup_report():
+    with _lock:
+        return dict(_marks)
+
+
+def _default_state_tasks():
+    """페이지별 기본 위젯 상태에서 필요한 집계를 미리 계산하는 작업 목록.
+
+    백엔드를 거치는 페이지(02·03·07·08)는 활성 백엔드로 질의하고, 메모리 내 데이터와
+    인덱스는 pandas 백엔드일 때만 미리 올립니다 (duckdb 는 Parquet 를 직접 질의).
+    """
+    from common.backend import get_backend
+    from common.cube import load_cube
+    from common.data import load_data, load_geo
+    from common.entities import load_country_index, load_entities
+    from common.frames import animation_frame_data
+    from common.quantiles import load_box_summaries
+    from common.ranges import load_range_aggregates
+    from common.ranking import load_growth_engine
+    from common.stats import load_year_stats
+
+    backend = get_backend()
+    tasks = {
+        "02": lambda: backend.share_by_year(1000),
+        "03": lambda: backend.rankings("gdp_pcap", 2000, 2020, kinds=("pct_change",)),
+        "07": backend.income_trends,
+        "08": lambda: backend.count_by_region(1000),
+    }
+    if backend.name != "pandas":
+        return tasks
+    return {
+        "data": load_data,
+        "geo": load_geo,
+        "cube": load_cube,
+        "01": lambda: load_range_aggregates().window_mean("lex", 2000, 2020),
+        "04": lambda: load_box_summaries().summary([2000, 2020]),
+        "05": lambda: (load_year_stats(), animation_frame_data(["gdp_pcap", "lex"], 1800, 2100, 10)),
+        "06": lambda: (load_entities(), load_growth_engine().rankings("pop", 1800, 2100, kinds=("change", "pct_change"))),
+        "09": lambda: (load_entities(), load_country_index()),
+        **tasks,
+    }
+
+
+def _run(name, task):
+    try:
+        task()
+        mark(f"warm:{name}")
+    except Exception:
+        logger.exception("warm-up task %s failed", name)
+
+
+def _attach_ctx(ctx):
+    # 캐시 함수가 스크립트 컨텍스트 없이 호출될 때 나는 경고를 피하기 위해 컨텍스트를 붙임
+    if ctx is None:
+        return
+    from streamlit.runtime.scriptrunner import add_script_run_ctx
+
+    add_script_run_ctx(threading.current_thread(), ctx)
+
+
+def _warm_all(pool):
+    for module in HEAVY_MODULES:
+        importlib.import_module(module)
+    mark("imports")
+    for name, task in _default_state_tasks().items():
+        pool.submit(_run, name, task)
+
+
+@st.cache_resource(show_spinner=False)
+def start_warmup():
+    """프로세스당 한 번 워밍업 스레드 풀을 시작합니다."""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    workers = int(os.environ.get("GAPMINDER_WARMUP_WORKERS", 4))
+    pool = ThreadPoolExecutor(
+        max_workers=workers,
+        thread_name_prefix="gapminder-warmup",
+        initializer=_attach_ctx,
+        initargs=(get_script_run_ctx(),),
+    )
+    pool.submit(_warm_all, pool)
+    return pool
+
+
+def boot(page=None):
+    """페이지 뼈대를 그린 직후 호출: first_paint 기록, 실행 추적 시작 후 워밍업 시작."""
+    mark("first_paint")
+    begin(page)
+    if os.environ.get("GAPMINDER_WARMUP", "1") != "0":
+        start_warmup()
@@ -0,0 +1,81 @@
+"""연도별 상관·회귀 통계 (연도 × 국가 큐브에서 한 번에 계산).
+
+``lex`` ~ ``log10(gdp_pcap)`` 에 대해 모든 연도의 Pearson/Spearman 상관계수와
+OLS 기울기·절편, 인구 가중 회귀를 행(연도) 단위 벡터 연산으로 구합니다.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from common import shared
+from common.cube import load_cube
+
+
+def _average_ranks(values, valid):
+    """행별 평균 순위 (동점은 평균 순위, 무효 칸은 NaN)."""
+    n_rows, n_cols = values.shape
+    filled = np.where(valid, values, np.inf)
+    order = np.argsort(filled, axis=1, kind="stable")
+    s = np.take_along_axis(filled, order, axis=1)
+    new_group = np.ones_like(s, dtype=bool)
+    new_group[:, 1:] = s[:, 1:] != s[:, :-1]
+    gid = np.cumsum(new_group, axis=1) - 1 + np.arange(n_rows)[:, None] * n_cols
+    pos = np.broadcast_to(np.arange(1, n_cols + 1, dtype=np.float64), s.shape)
+    mean_rank = np.bincount(gid.ravel(), pos.ravel(), n_rows * n_cols) / np.maximum(
+        np.bincount(gid.ravel(), minlength=n_rows * n_cols), 1
+    )
+    ranks = np.empty_like(s, dtype=np.float64)
+    np.put_along_axis(ranks, order, mean_rank[gid], axis=1)
+    return np.where(valid, ranks, np.nan)
+
+
+def _fit(x, y, w):
+    """행별 가중 상관계수·기울기·절편. w 는 무효 칸이 0 인 가중치 행렬."""
+    sw = w.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mx = (w * np.nan_to_num(x)).sum(axis=1) / sw
+        my = (w * np.nan_to_num(y)).sum(axis=1) / sw
+        dx = np.where(w > 0, x - mx[:, None], 0.0)
+        dy = np.where(w > 0, y - my[:, None], 0.0)
+        sxy = (w * dx * dy).sum(axis=1)
+        sxx = (w * dx * dx).sum(axis=1)
+        syy = (w * dy * dy).sum(axis=1)
+        slope = sxy / sxx
+        return sxy / np.sqrt(sxx * syy), slope, my - slope * mx
+
+
+def per_year_stats(cube, x="gdp_pcap", y="lex", weight="pop"):
+    """연도별 통계 DataFrame (index=year).
+
+    columns: n, pearson, spearman, slope, intercept, w_pearson, w_slope, w_intercept
+    기울기는 1인당 GDP 가 10배 될 때의 기대수명 변화입니다.
+    """
+    gx = cube.get_matrix(x).astype(np.float64)
+    ly = cube.get_matrix(y).astype(np.float64)
+    pw = cube.get_matrix(weight).astype(np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        lx = np.log10(np.where(gx > 0, gx, np.nan))
+    valid = ~np.isnan(lx) & ~np.isnan(ly)
+
+    ones = valid.astype(np.float64)
+    pearson, slope, intercept = _fit(lx, ly, ones)
+    spearman, _, _ = _fit(_average_ranks(lx, valid), _average_ranks(ly, valid), ones)
+    w = np.where(valid & ~np.isnan(pw), pw, 0.0)
+    w_pearson, w_slope, w_intercept = _fit(lx, ly, w)
+
+    return pd.DataFrame({
+        "n": valid.sum(axis=1),
+        "pearson": pearson,
+        "spearman": spearman,
+        "slope": slope,
+        "intercept": intercept,
+        "w_pearson": w_pearson,
+        "w_slope": w_slope,
+        "w_intercept": w_intercept,
+    }, index=pd.Index(cube.years, name="year"))
+
+
+@st.cache_resource(show_spinner=False)
+@shared.resource("year_stats")
+def load_year_stats():
+    return per_year_stats(load_cube())
@@ -0,0 +1,89 @@
+"""기준값 미만 국가 수/비율을 모든 연도에 대해 한 번에 계산하는 인덱스.
+
+그룹(연도, 또는 연도 × 권역)마다 값을 정렬해 두고, 그룹 번호만큼 떨어진 구간으로
+이어 붙인 1차원 키 배열 하나에 ``np.searchsorted`` 를 적용합니다. 따라서 기준값 하나,
+혹은 여러 기준값에 대한 전체 그룹의 결과를 파이썬 루프 없이 얻을 수 있습니다.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from common import shared
+from common.data import load_data
+
+
+class ThresholdIndex:
+    """values 를 group 별로 정렬한 인덱스. NaN 값은 어떤 기준값에도 포함되지 않습니다."""
+
+    def __init__(self, values, groups, n_groups):
+        values = np.asarray(values, dtype=np.float64)
+        groups = np.asarray(groups, dtype=np.int64)
+        # 분모는 결측을 포함한 그룹별 전체 행 수 (기존 페이지의 .mean() 과 동일)
+        self.totals = np.bincount(groups, minlength=n_groups)
+
+        valid = ~np.isnan(values)
+        values, groups = values[valid], groups[valid]
+        self.vmin = values.min()
+        self.span = values.max() - self.vmin + 2
+        self.offsets = np.arange(n_groups) * self.span
+        self.keys = np.sort(groups * self.span + (values - self.vmin))
+        self.starts = np.searchsorted(self.keys, self.offsets)
+
+    def count_below(self, thresholds):
+        """기준값(스칼라 또는 배열) 미만 개수. 결과 shape = (그룹 수,) + thresholds.shape"""
+        t = np.clip(np.asarray(thresholds, dtype=np.float64) - self.vmin, 0, self.span - 1)
+        queries = self.offsets.reshape((-1,) + (1,) * t.ndim) + t
+        return np.searchsorted(self.keys, queries) - self.starts.reshape(queries.shape[:1] + (1,) * t.ndim)
+
+    def share_below(self, thresholds):
+        """기준값 미만 비율(%)."""
+        counts = self.count_below(thresholds)
+        totals = self.totals.reshape(counts.shape[:1] + (1,) * (counts.ndim - 1))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return counts / totals * 100
+
+
+class GdpThresholds:
+    """연도별, 연도 × 권역별 1인당 GDP 기준값 질의."""
+
+    def __init__(self, df, metric="gdp_pcap", region="world_4region"):
+        self.year_min = int(df["year"].min())
+        self.years = np.arange(self.year_min, int(df["year"].max()) + 1)
+        self.regions = pd.Index(df[region].cat.categories, name=region)
+        self.region_col = region
+
+        year_idx = df["year"].to_numpy().astype(np.int64) - self.year_min
+        region_idx = df[region].cat.codes.to_numpy().astype(np.int64)
+        values = df[metric].to_numpy()
+        n_years = len(self.years)
+
+        self.by_year = ThresholdIndex(values, year_idx, n_years)
+        known = region_idx >= 0
+        self.by_year_region = ThresholdIndex(
+            values[known],
+            year_idx[known] * len(self.regions) + region_idx[known],
+            n_years * len(self.regions),
+        )
+
+    def share_by_year(self, threshold):
+        """연도별 기준값 미만 비율(%) → DataFrame[year, pct]"""
+        return pd.DataFrame({"year": self.years, "pct": self.by_year.share_below(threshold)})
+
+    def count_by_region(self, threshold):
+        """연도 × 권역별 기준값 미만 국가 수 → DataFrame[year, region, count]"""
+        counts = self.by_year_region.count_below(threshold)
+        return pd.DataFrame({
+            "year": np.repeat(self.years, len(self.regions)),
+            self.region_col: np.tile(self.regions.to_numpy(), len(self.years)),
+            "count": counts,
+        })
+
+    def share_curve(self, thresholds):
+        """여러 기준값에 대한 연도별 비율(%) 행렬, shape = (연도 수, 기준값 수)."""
+        return self.by_year.share_below(np.asarray(thresholds))
+
+
+@st.cache_resource(show_spinner=False)
+@shared.resource("gdp_thresholds")
+def load_gdp_thresholds():
+    return GdpThresholds(load_data())
@@ -0,0 +1,240 @@
+"""페이지 실행 구간 추적: 로드·집계·그림 생성·직렬화 단계별 시간.
+
+페이지는 ``span(stage, name)`` 으로 느려질 수 있는 구간을 감쌉니다. 단계(stage)는
+``load``(데이터 로드), ``aggregate``(집계), ``figure``(그림 생성·최적화),
+``serialize``(JSON 직렬화·전송) 중 하나입니다. 구간은 중첩될 수 있고, 단계별 합계는
+안쪽 구간을 뺀 자기 시간(self time)으로 셉니다.
+
+실행(trace) 단위:
+
+- 전체 스크립트 실행은 ``boot(page)`` 에서 시작해 페이지 끝의 ``debug_panel()`` 에서 끝납니다.
+- 프래그먼트만 다시 실행될 때는 ``@trace_fragment(page)`` 가 별도 실행으로 기록합니다.
+
+구간과 실행 요약은 ``gapminder.trace`` 로거에 JSON 한 줄씩 남습니다 (페이지별 지연 백분위
+집계용). ``?debug=1`` 쿼리 파라미터나 환경 변수 ``GAPMINDER_DEBUG=1`` 이면 사이드바에
+구간표와 캐시 적중 수를 보여주는 디버그 패널이 나타납니다.
+
+구조화 로그(``gapminder.trace``, ``gapminder.startup``, ``gapminder.render``)는 기본적으로
+출력되지 않습니다. 환경 변수 ``GAPMINDER_TRACE_LOG`` 를 ``stderr`` 또는 파일 경로로 지정하면
+INFO 수준으로 JSON 한 줄씩 기록합니다::
+
+    GAPMINDER_TRACE_LOG=stderr streamlit run main.py
+    GAPMINDER_TRACE_LOG=logs/trace.jsonl streamlit run main.py
+
+이 모듈은 pandas·plotly 를 import 하지 않습니다 (``common.startup`` 에서 사용).
+"""
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import streamlit as st
+
+logger = logging.getLogger("gapminder.trace")
+
+STAGES = ("load", "aggregate", "figure", "serialize")
+HISTORY = 20
+_SPAN_FIELDS = ("stage", "name", "ms", "self_ms", "depth", "start")
+_HISTORY_KEY = "_traces"
+STRUCTURED_LOGGERS = ("gapminder.trace", "gapminder.startup", "gapminder.render")
+
+_local = threading.local()
+
+
+def configure_logging(target=None):
+    """구조화 로거에 JSON 한 줄 핸들러를 붙입니다 (target: 'stderr' 또는 파일 경로, 없으면 환경 변수).
+
+    프로세스당 한 번만 붙이며, 대상이 없으면 아무것도 하지 않습니다.
+    """
+    target = target or os.environ.get("GAPMINDER_TRACE_LOG")
+    if not target:
+        return None
+    if target == "stderr":
+        handler = logging.StreamHandler()
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+        handler = logging.FileHandler(target, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    handler.set_name("gapminder-trace-log")
+    for name in STRUCTURED_LOGGERS:
+        log = logging.getLogger(name)
+        if not any(h.get_name() == handler.get_name() for h in log.handlers):
+            log.addHandler(handler)
+        log.setLevel(logging.INFO)
+    return handler
+
+
+configure_logging()
+
+
+class Trace:
+    """한 번의 실행에서 기록된 구간과 카운터."""
+
+    def __init__(self, page, kind):
+        self.page = page
+        self.kind = kind
+        self.run_id = uuid.uuid4().hex[:8]
+        self.started = time.perf_counter()
+        self.spans = []
+        self.counters = {}
+        self._stack = []
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def stage_totals(self):
+        totals = dict.fromkeys(STAGES, 0.0)
+        for s in self.spans:
+            totals[s["stage"]] = totals.get(s["stage"], 0.0) + s["self_ms"]
+        return {k: round(v, 2) for k, v in totals.items()}
+
+    def summary(self):
+        return {
+            "page": self.page,
+            "kind": self.kind,
+            "run": self.run_id,
+            "total_ms": round(self.elapsed_ms(), 2),
+            "stages": self.stage_totals(),
+            "counters": dict(self.counters),
+        }
+
+
+def current():
+    return getattr(_local, "trace", None)
+
+
+def begin(page, kind="script"):
+    """현재 스레드에서 새 실행 기록을 시작합니다."""
+    _local.trace = Trace(page, kind)
+    return _local.trace
+
+
+def finish():
+    """현재 실행 기록을 끝내고 요약을 로그와 세션 기록에 남깁니다."""
+    trace = current()
+    if trace is None:
+        return None
+    _local.trace = None
+    summary = trace.summary()
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps({"event": "trace", **summary}, ensure_ascii=False))
+    try:
+        history = st.session_state.setdefault(_HISTORY_KEY, [])
+        history.append(summary)
+        del history[:-HISTORY]
+    except Exception:
+        # 스크립트 컨텍스트 밖(CLI·워밍업 스레드)에서는 세션 기록 없이 로그만 남김
+        pass
+    return trace
+
+
+@contextmanager
+def span(stage, name=None, **attrs):
+    """stage 구간을 측정합니다. 실행 기록이 없으면 로그만 남깁니다."""
+    trace = current()
+    record = {"stage": stage, "name": name, "child_ms": 0.0, **attrs}
+    start = time.perf_counter()
+    if trace is not None:
+        record["depth"] = len(trace._stack)
+        record["start"] = round((start - trace.started) * 1000, 2)
+        trace._stack.append(record)
+    try:
+        yield record
+    finally:
+        ms = (time.perf_counter() - start) * 1000
+        record["ms"] = round(ms, 2)
+        record["self_ms"] = round(ms - record.pop("child_ms"), 2)
+        if trace is not None:
+            trace._stack.pop()
+            if trace._stack:
+                trace._stack[-1]["child_ms"] += ms
+            trace.spans.append(record)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({
+                "event": "span",
+                "page": trace.page if trace else None,
+                "run": trace.run_id if trace else None,
+                **record,
+            }, ensure_ascii=False, default=str))
+
+
+def count(name, n=1):
+    """현재 실행의 카운터 (캐시 적중·실패 등) 를 n 만큼 올립니다."""
+    trace = current()
+    if trace is not None:
+        trace.counters[name] = trace.counters.get(name, 0) + n
+
+
+def _fragment_rerun():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return bool(ctx is not None and getattr(ctx, "fragment_ids_this_run", None))
+
+
+def trace_fragment(page):
+    """프래그먼트 함수용 데코레이터 (``@st.fragment`` 아래에 둡니다).
+
+    전체 실행 중에는 하나의 구간으로, 프래그먼트만 다시 실행될 때는 별도 실행으로 기록합니다.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _fragment_rerun():
+                return func(*args, **kwargs)
+            begin(page, kind=f"fragment:{func.__name__}")
+            try:
+                return func(*args, **kwargs)
+            finally:
+                finish()
+        return wrapper
+    return decorator
+
+
+def debug_enabled():
+    if os.environ.get("GAPMINDER_DEBUG") == "1":
+        return True
+    try:
+        return st.query_params.get("debug") == "1"
+    except Exception:
+        return False
+
+
+def debug_panel():
+    """페이지 끝에서 호출: 실행 기록을 마치고, 디버그 모드면 사이드바 패널을 그립니다."""
+    trace = finish()
+    if trace is None or not debug_enabled():
+        return
+    from common.figcache import get_figure_cache
+    from common.startup import startup_report
+
+    with st.sidebar.expander("🛠 디버그: 실행 구간", expanded=True):
+        st.caption(f"page {trace.page} · run {trace.run_id} · 총 {trace.elapsed_ms():.1f} ms")
+        st.markdown("**단계별 시간 (ms, 자기 시간)**")
+        st.table([trace.stage_totals()])
+        st.markdown("**구간**")
+        st.table([
+            {
+                "stage": "· " * s["depth"] + s["stage"],
+                "name": s["name"],
+                "ms": s["ms"],
+                "self_ms": s["self_ms"],
+                **{k: v for k, v in s.items() if k not in _SPAN_FIELDS},
+            }
+            for s in sorted(trace.spans, key=lambda s: s["start"])
+        ])
+        st.markdown("**이번 실행 카운터**")
+        st.json(trace.counters)
+        st.markdown("**그림 캐시 (프로세스 전체)**")
+        st.json(get_figure_cache().stats())
+        st.markdown("**시작 타이머 (초)**")
+        st.json(startup_report())
+        st.markdown("**최근 실행**")
+        st.table([
+            {"run": h["run"], "kind": h["kind"], "total_ms": h["total_ms"], **h["stages"]}
+            for h in reversed(st.session_state.get(_HISTORY_KEY, []))
+        ])
@@ -47,3 +47,7 @@ st.markdown(
 ✨ **지금 바로** 왼쪽 메뉴를 눌러 호버, 슬라이더, 멀티셀렉트 등 다양한 인터랙티브 컨트롤을 활용하며 직접 데이터 속으로 뛰어들어 보세요!  
 """
 )
+
+# 랜딩 페이지를 그린 뒤 백그라운드에서 데이터·기본 집계를 미리 준비 (첫 차트 대기 시간 단축)
+from common.startup import boot
+boot()
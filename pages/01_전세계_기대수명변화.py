@@ -1,42 +1,71 @@
 # 페이지별 공통 템플릿 포함
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-
-@st.cache_data
-def load_data():
-    return pd.read_csv('data/merged_gapminder.csv')
-
-df = load_data()
 
 st.title("SDG 3: 전 세계 기대수명 변화")
 st.write("1800년부터 2100년까지 전 세계 평균 기대수명이 어떻게 변화했는지 탐구합니다.")
 st.markdown("---")
 
-# 연도 범위 선택
-start_year, end_year = st.slider(
-    "연도 범위 선택", int(df.year.min()), int(df.year.max()), (2000, 2020)
-)
-# 선택 구간 데이터 필터링
-time_series = df.groupby('year').lex.mean().reset_index()
-subset = time_series[(time_series.year >= start_year) & (time_series.year <= end_year)]
-# 범위 평균 계산
-avg = subset.lex.mean()
-st.write(f"**{start_year}년부터 {end_year}년까지 평균 기대수명:** {avg:.2f}세")
-
-# 범위 내 시계열 그래프
-fig = px.line(
-    subset,
-    x='year',
-    y='lex',
-    labels={'year':'연도','lex':'평균 기대수명(세)'},
-    title=f"{start_year}~{end_year}년 기대수명 변화"
-)
-st.plotly_chart(fig, use_container_width=True)
+# 페이지 뼈대를 먼저 그린 뒤 무거운 모듈을 불러옴 (콜드 스타트 단축)
+from common.startup import boot
+boot("01")
+
+import plotly.express as px
+
+from common.ranges import load_range_aggregates
+from common.render import show_chart
+from common.tracing import debug_panel, span, trace_fragment
+
+with span("load", "range_aggregates"):
+    agg = load_range_aggregates()
+
+# 위젯 변경 시 이 영역만 다시 실행 (st.fragment)
+@st.fragment
+@trace_fragment("01")
+def life_expectancy_window():
+    # 연도 범위 선택
+    start_year, end_year = st.slider(
+        "연도 범위 선택", int(agg.years[0]), int(agg.years[-1]), (2000, 2020)
+    )
+    levels = {'전세계': 'world', '권역별': 'world_4region', '소득그룹별': 'income_groups'}
+    col1, col2 = st.columns(2)
+    level = levels[col1.radio("비교 단위", list(levels), horizontal=True)]
+    weighted = col2.toggle("인구 가중 평균", value=False)
+
+    # 누적합 인덱스로 구간 평균을 바로 계산
+    with span("aggregate", "window_mean"):
+        avg = agg.window_mean('lex', start_year, end_year, level=level, weighted=weighted)
+    if level == 'world':
+        st.write(f"**{start_year}년부터 {end_year}년까지 평균 기대수명:** {avg['world']:.2f}세")
+    else:
+        st.write(f"**{start_year}년부터 {end_year}년까지 평균 기대수명:** " + ", ".join(
+            f"{g} {v:.2f}세" for g, v in avg.items()
+        ))
+
+    # 범위 내 시계열 그래프
+    with span("aggregate", "yearly_mean"):
+        subset = (
+            agg.yearly_mean('lex', level=level, weighted=weighted, start=start_year, end=end_year)
+            .melt(ignore_index=False, value_name='lex')
+            .reset_index()
+        )
+    with span("figure", "px.line"):
+        fig = px.line(
+            subset,
+            x='year',
+            y='lex',
+            color=None if level == 'world' else level,
+            labels={'year':'연도','lex':'평균 기대수명(세)'},
+            title=f"{start_year}~{end_year}년 기대수명 변화",
+            render_mode='svg',
+        )
+    show_chart(fig, page='01')
+
+life_expectancy_window()
 
 with st.expander("🔍 사용 설명서 설명 보기"):
     st.write(
         "- 슬라이더로 시작·끝 연도를 조정하여 구간을 변경할 수 있습니다."
+        "- 비교 단위로 권역별·소득그룹별 평균을, 토글로 인구 가중 평균을 볼 수 있습니다."
         "- 그래프 위에 마우스를 올리면 연도별 기대수명 수치를 확인할 수 있습니다."
     )
 
@@ -51,3 +80,5 @@ with st.expander("📚 교육적 함의 및 확장 활동"):
         "- 데이터 필터링과 통계적 평균의 개념 이해."
         "- 선택 구간의 역사적·사회적 요인 연결 탐구."
     )
+
+debug_panel()
@@ -1,6 +1,4 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 
 st.title("SDG 1: 저소득 국가 비율 변화")
 st.write(
@@ -8,20 +6,53 @@ st.write(
 )
 st.markdown("---")
 
-@st.cache_data
-def load_data():
-    return pd.read_csv('data/merged_gapminder.csv')
+# 페이지 뼈대를 먼저 그린 뒤 무거운 모듈을 불러옴 (콜드 스타트 단축)
+from common.startup import boot
+boot("02")
+
+import numpy as np
+import plotly.express as px
+
+from common.backend import get_backend
+from common.render import show_chart
+from common.tracing import debug_panel, span, trace_fragment
+
+# 집계는 질의 백엔드에서 (기본 pandas, GAPMINDER_BACKEND=duckdb 이면 Parquet 에 푸시다운)
+with span("load", "backend"):
+    backend = get_backend()
 
-df = load_data()
-threshold = st.number_input("저소득 기준 (USD)", value=1000)
-low_pct = df.groupby('year').apply(
-    lambda x: (x.gdp_pcap < threshold).mean()*100
-).reset_index(name='pct')
-fig = px.area(low_pct, x='year', y='pct', labels={'pct':'저소득 국가 비율(%)'})
-st.plotly_chart(fig, use_container_width=True)
+# 기준값 변경 시 영역 차트만 다시 실행 (히트맵은 기준값과 무관)
+@st.fragment
+@trace_fragment("02")
+def low_income_share():
+    threshold = st.number_input("저소득 기준 (USD)", value=1000)
+    with span("aggregate", "share_by_year"):
+        low_pct = backend.share_by_year(threshold)
+    with span("figure", "px.area"):
+        fig = px.area(low_pct, x='year', y='pct', labels={'pct':'저소득 국가 비율(%)'})
+    show_chart(fig, page='02')
+
+low_income_share()
+
+# 기준값 스윕 히트맵: 여러 기준값에 대한 연도별 비율을 한 번에 계산
+st.subheader("기준값별 저소득 국가 비율 히트맵")
+thresholds = np.geomspace(250, 50000, 40).round(-1)
+with span("aggregate", "share_curve"):
+    sweep_years, sweep = backend.share_curve(thresholds)
+with span("figure", "px.imshow"):
+    fig_sweep = px.imshow(
+        sweep.T,
+        x=sweep_years,
+        y=[f"{t:,.0f}" for t in thresholds],
+        origin='lower',
+        aspect='auto',
+        color_continuous_scale='Reds',
+        labels={'x':'연도', 'y':'저소득 기준 (USD)', 'color':'비율(%)'},
+    )
+show_chart(fig_sweep, page='02')
 
 with st.expander("🔍 사용 설명서 설명 보기"):
-    st.write("- 기준값을 조정하여 변화 추이를 확인하세요.\n- 영역 차트 위 마우스 오버로 연도별 비율 조회.")
+    st.write("- 기준값을 조정하여 변화 추이를 확인하세요.\n- 영역 차트 위 마우스 오버로 연도별 비율 조회.\n- 히트맵에서 기준값과 연도에 따른 비율 변화를 한눈에 비교하세요.")
 
 with st.expander("💡 학생 토론 질문"):
     st.markdown(
@@ -34,3 +65,5 @@ with st.expander("📚 교육적 함의 및 확장 활동"):
         "- 빈곤 정의와 기준의 다양성 이해.\n"
         "- 글로벌 빈곤 퇴치 정책 토론."
     )
+
+debug_panel()
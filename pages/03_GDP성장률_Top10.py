@@ -1,6 +1,4 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 
 st.title("SDG 8: GDP 성장률 Top10 국가 비교")
 st.write(
@@ -8,22 +6,46 @@ st.write(
 )
 st.markdown("---")
 
-@st.cache_data
-def load_data():
-    return pd.read_csv('data/merged_gapminder.csv')
+# 페이지 뼈대를 먼저 그린 뒤 무거운 모듈을 불러옴 (콜드 스타트 단축)
+from common.startup import boot
+boot("03")
 
-df = load_data()
-y1, y2 = st.select_slider(
-    "기간 선택", options=sorted(df.year.unique()), value=(2000,2020)
-)
-sub = df[df.year.isin([y1,y2])].pivot(index='country', columns='year', values='gdp_pcap').dropna()
-sub['growth'] = (sub[y2]-sub[y1]) / sub[y1] * 100
-top10 = sub.sort_values('growth', ascending=False).head(10).reset_index()
-fig = px.bar(top10, x='country', y='growth', labels={'growth':'성장률(%)'})
-st.plotly_chart(fig, use_container_width=True)
+import plotly.express as px
+
+from common.backend import get_backend
+from common.render import show_chart
+from common.tracing import debug_panel, span, trace_fragment
+
+# 집계는 질의 백엔드에서 (기본 pandas, GAPMINDER_BACKEND=duckdb 이면 Parquet 에 푸시다운)
+with span("load", "backend"):
+    backend = get_backend()
+    years = backend.years().tolist()
+
+# 위젯 변경 시 이 영역만 다시 실행 (st.fragment)
+@st.fragment
+@trace_fragment("03")
+def growth_top10():
+    y1, y2 = st.select_slider(
+        "기간 선택", options=years, value=(2000,2020)
+    )
+    metrics = {'1인당 GDP': 'gdp_pcap', '기대수명': 'lex', '인구': 'pop'}
+    kinds = {'성장률(%)': 'pct_change', '연평균 성장률(CAGR, %)': 'cagr', '절대 증가량': 'change'}
+    col1, col2 = st.columns(2)
+    metric = metrics[col1.selectbox("지표", list(metrics))]
+    kind_label = col2.radio("순위 기준", list(kinds), horizontal=True)
+    kind = kinds[kind_label]
+
+    # 두 연도의 값만 읽어 변화량을 구하고 상위 10개만 추출
+    with span("aggregate", "rankings"):
+        top10, _ = backend.rankings(metric, y1, y2, kinds=(kind,), k=10)[kind]
+    with span("figure", "px.bar"):
+        fig = px.bar(top10, x='country', y=kind, labels={kind: kind_label})
+    show_chart(fig, page='03')
+
+growth_top10()
 
 with st.expander("🔍 사용 설명서 설명 보기"):
-    st.write("- 슬라이더로 시작 연도와 종료 연도를 설정하세요.\n- 막대 위 마우스 오버로 성장률 확인.")
+    st.write("- 슬라이더로 시작 연도와 종료 연도를 설정하세요.\n- 지표와 순위 기준(성장률·연평균 성장률·절대 증가량)을 바꿔 비교해 보세요.\n- 막대 위 마우스 오버로 성장률 확인.")
 
 with st.expander("💡 학생 토론 질문"):
     st.markdown(
@@ -36,3 +58,5 @@ with st.expander("📚 교육적 함의 및 확장 활동"):
         "- 경제성장과 사회적 영향 분석.\n"
         "- 성장 전략 모의 정책 설계."
     )
+
+debug_panel()
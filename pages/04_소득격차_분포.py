@@ -1,6 +1,4 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 
 st.title("SDG 10: 소득그룹별 1인당 GDP 분포")
 st.write(
@@ -8,18 +6,69 @@ st.write(
 )
 st.markdown("---")
 
-@st.cache_data
-def load_data():
-    return pd.read_csv('data/merged_gapminder.csv')
+# 페이지 뼈대를 먼저 그린 뒤 무거운 모듈을 불러옴 (콜드 스타트 단축)
+from common.startup import boot
+boot("04")
+
+import plotly.express as px
+import plotly.graph_objects as go
+
+from common.quantiles import load_box_summaries
+from common.render import show_chart
+from common.tracing import debug_panel, span, trace_fragment
 
-df = load_data()
-years = st.multiselect("연도 선택", options=sorted(df.year.unique()), default=[2000,2020])
-sub = df[df.year.isin(years)]
-fig = px.box(sub, x='income_groups', y='gdp_pcap', color='year', labels={'gdp_pcap':'1인당 GDP'})
-st.plotly_chart(fig, use_container_width=True)
+with span("load", "box_summaries"):
+    summaries = load_box_summaries()
+
+# 위젯 변경 시 이 영역만 다시 실행 (st.fragment)
+@st.fragment
+@trace_fragment("04")
+def income_distribution():
+    years = st.multiselect("연도 선택", options=summaries.years.tolist(), default=[2000,2020])
+    view = st.radio("표시 방식", ["박스 플롯", "밀도(KDE)"], horizontal=True)
+
+    # 원본 행 대신 (연도, 소득그룹)별 요약값만 전송하여 연도 수와 관계없이 크기가 일정
+    colors = px.colors.qualitative.Plotly
+    if view == "박스 플롯":
+        with span("aggregate", "box_summary"):
+            stats = summaries.summary(years)
+            outliers = summaries.outliers(years)
+        with span("figure", "go.Box"):
+            fig = go.Figure()
+            for i, year in enumerate(years):
+                s_year = stats[stats.year == year]
+                o_year = outliers[outliers.year == year]
+                color = colors[i % len(colors)]
+                fig.add_trace(go.Box(
+                    x=s_year.group, q1=s_year.q1, median=s_year['median'], q3=s_year.q3, mean=s_year['mean'],
+                    lowerfence=s_year.lowerfence, upperfence=s_year.upperfence,
+                    name=str(year), legendgroup=str(year), offsetgroup=str(year), marker_color=color,
+                ))
+                fig.add_trace(go.Scatter(
+                    x=o_year.group, y=o_year.value, mode='markers', text=o_year.country,
+                    name=str(year), legendgroup=str(year), offsetgroup=str(year), showlegend=False,
+                    marker=dict(color=color, size=5), hovertemplate="%{text}: %{y:,.0f}<extra></extra>",
+                ))
+            fig.update_layout(
+                boxmode='group', scattermode='group', legend_title_text='year',
+                xaxis_title='income_groups', yaxis_title='1인당 GDP',
+            )
+    else:
+        with span("aggregate", "density"):
+            dens = summaries.density(years)
+        with span("figure", "px.line"):
+            fig = px.line(
+                dens, x='value', y='density', color='year', facet_col='group', facet_col_wrap=2,
+                log_x=True, labels={'value':'1인당 GDP', 'density':'밀도'},
+                category_orders={'group': summaries.groups},
+                render_mode='svg',
+            )
+    show_chart(fig, page='04')
+
+income_distribution()
 
 with st.expander("🔍 사용 설명서 설명 보기"):
-    st.write("- 멀티셀렉트로 비교할 연도를 선택하세요.\n- 박스 플롯의 분포와 이상치 주목.")
+    st.write("- 멀티셀렉트로 비교할 연도를 선택하세요.\n- 박스 플롯의 분포와 이상치 주목.\n- 밀도(KDE) 보기로 그룹별 분포 모양을 비교해 보세요.")
 
 with st.expander("💡 학생 토론 질문"):
     st.markdown(
@@ -32,3 +81,5 @@ with st.expander("📚 교육적 함의 및 확장 활동"):
         "- 사회경제적 격차 이해.\n"
         "- 불평등 해소를 위한 정책 제안."
     )
+
+debug_panel()
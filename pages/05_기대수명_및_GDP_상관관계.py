@@ -1,12 +1,4 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-
-@st.cache_data
-def load_data():
-    return pd.read_csv('data/merged_gapminder.csv')
-
-df = load_data()
 
 st.title("SDG 3&8: 기대수명 vs GDP 상관관계")
 st.write(
@@ -14,25 +6,105 @@ st.write(
 )
 st.markdown("---")
 
-fig = px.scatter(
-    df,
-    x='gdp_pcap',
-    y='lex',
-    animation_frame='year',
-    animation_group='country',
-    log_x=True,
-    size_max=45,
-    hover_name='country',
-    hover_data={'year': True, 'gdp_pcap':':,.2f', 'lex':':.2f'},
-    labels={'gdp_pcap':'1인당 GDP','lex':'기대수명'},
-    title="기대수명↔GDP 상관관계"
-)
+# 페이지 뼈대를 먼저 그린 뒤 무거운 모듈을 불러옴 (콜드 스타트 단축)
+from common.startup import boot
+boot("05")
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+from common.cube import load_cube
+from common.frames import animation_frame_data, frame_years
+from common.render import show_cached_chart, show_chart
+from common.stats import load_year_stats
+from common.tracing import debug_panel, span, trace_fragment
+
+with span("load", "cube"):
+    cube = load_cube()
+with span("load", "year_stats"):
+    year_stats = load_year_stats()
 
-st.plotly_chart(fig, use_container_width=True)
+def build_figure(start, end, stride, fit=None):
+    """선택 범위·간격의 애니메이션 그림.
+
+    fit 이 'ols' 또는 'weighted' 이면 프레임마다 미리 계산된 회귀선을 추가합니다.
+    """
+    with span("aggregate", "animation_frame_data"):
+        frames = animation_frame_data(['gdp_pcap', 'lex'], start, end, stride)
+    fig = px.scatter(
+        frames,
+        x='gdp_pcap',
+        y='lex',
+        animation_frame='year',
+        animation_group='country',
+        log_x=True,
+        size_max=45,
+        render_mode='svg',
+        hover_name='country',
+        hover_data={'year': True, 'gdp_pcap':':,.2f', 'lex':':.2f'},
+        labels={'gdp_pcap':'1인당 GDP','lex':'기대수명'},
+        title="기대수명↔GDP 상관관계"
+    )
+    if fit:
+        prefix = 'w_' if fit == 'weighted' else ''
+        stats = load_year_stats()
+        x_line = np.geomspace(frames.gdp_pcap.min(), frames.gdp_pcap.max(), 2)
+
+        def fit_line(year):
+            row = stats.loc[int(year)]
+            return go.Scatter(
+                x=x_line, y=row[prefix + 'intercept'] + row[prefix + 'slope'] * np.log10(x_line),
+                mode='lines', line=dict(color='firebrick'), name='회귀선', hoverinfo='skip',
+            )
+
+        # 한 해만 선택하면 px 가 프레임을 만들지 않으므로 그 해의 회귀선만 그림
+        fig.add_trace(fit_line(fig.frames[0].name if fig.frames else start))
+        for frame in fig.frames:
+            frame.data = tuple(frame.data) + (fit_line(frame.name),)
+    return fig
+
+# 위젯 변경 시 이 영역만 다시 실행 (st.fragment)
+@st.fragment
+@trace_fragment("05")
+def correlation_charts():
+    # 처음에는 10년 간격의 거친 프레임만 보내고, 필요하면 범위·간격을 좁혀 세밀하게 봅니다.
+    col1, col2 = st.columns([3, 1])
+    start_year, end_year = col1.slider(
+        "연도 범위", int(cube.years[0]), int(cube.years[-1]), (int(cube.years[0]), int(cube.years[-1]))
+    )
+    stride = col2.select_slider("프레임 간격(년)", options=[1, 2, 5, 10, 20], value=10)
+    st.caption(f"프레임 수: {len(frame_years(start_year, end_year, stride))}개")
+
+    fits = {'없음': None, '최소제곱(OLS)': 'ols', '인구 가중 OLS': 'weighted'}
+    fit = fits[st.radio("회귀선", list(fits), horizontal=True)]
+
+    # 직렬화된 그림은 세션 간 공유 캐시에서 재사용 (없을 때만 프레임 집계·그림 생성)
+    with st.spinner("애니메이션 프레임 생성 중..."):
+        # 호버의 year(customdata)는 애니메이션 프레임 라벨과 같으므로 WebGL 전환 시 뺌
+        show_cached_chart('05', {'start': start_year, 'end': end_year, 'stride': stride, 'fit': fit},
+                          lambda: build_figure(start_year, end_year, stride, fit), drop_customdata=True)
+
+    # 연도별 상관계수 추이 (모든 연도를 한 번에 계산해 둔 값)
+    with span("aggregate", "year_stats"):
+        corr = year_stats.loc[start_year:end_year, ['pearson', 'spearman']].reset_index()
+    with span("figure", "px.line"):
+        fig_corr = px.line(
+            corr.melt(id_vars='year', var_name='계수', value_name='상관계수'),
+            x='year', y='상관계수', color='계수',
+            labels={'year':'연도'},
+            title="기대수명 vs log(1인당 GDP) 상관계수 변화",
+            render_mode='svg',
+        )
+    show_chart(fig_corr, page='05')
+
+correlation_charts()
 
 with st.expander("🔍 사용 설명서 설명 보기"):
     st.write(
         "- 애니메이션 재생 버튼으로 연도별 변화를 확인하세요."
+        "- 연도 범위를 좁히고 프레임 간격을 줄이면 더 촘촘한 애니메이션을 볼 수 있습니다."
+        "- 회귀선을 켜면 연도별 회귀선이, 아래 그래프에서는 상관계수 추이가 표시됩니다."
         "- 각 점 위로 마우스를 올려 국가, 연도, GDP, 기대수명을 정확히 확인할 수 있습니다."
     )
 
@@ -47,3 +119,5 @@ with st.expander("📚 교육적 함의 및 확장 활동"):
         "- 경제발전과 공중보건의 상관성을 시각적으로 이해합니다."
         "- 정책 결정 시 데이터를 활용한 근거 마련 방법을 학습합니다."
     )
+
+debug_panel()
@@ -1,120 +1,109 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-
-@st.cache_data
-def load_data():
-    df_main = pd.read_csv('data/merged_gapminder.csv')
-    df_geo  = (
-        pd.read_csv('data/ddf--entities--geo--country.csv', usecols=['country','name'])
-          .rename(columns={'name':'full_name'})
-    )
-    df = df_main.merge(df_geo, on='country', how='left')
-    df['full_name'] = df['full_name'].replace({
-        'South Korea':    'Republic of Korea',
-        'USA':            'United States',
-        'UK':             'United Kingdom',
-    })
-    df['display_name'] = df['full_name']
-    return df
-
-df = load_data()
 
 st.title("SDG 11: 인구증가·감소 Top 10 & 증감 비율 Top 10")
 st.write("선택한 기간 동안 인구 증가량/감소량과 전체 인구 대비 증감 비율 Top 10 국가를 지도로 시각화합니다.")
 st.markdown("---")
 
-# 기간 선택
-years = sorted(df['year'].unique())
-y1, y2 = st.select_slider("기간 선택", options=years, value=(years[0], years[-1]))
-
-# 피벗 및 변화량 계산
-pop = (
-    df[df.year.isin([y1, y2])]
-    .pivot(index='country', columns='year', values='pop')
-    .dropna()
-)
-pop['change'] = pop[y2] - pop[y1]
-pop['pct_change'] = pop['change'] / pop[y1] * 100
-
-# 국가 이름 매핑 (중복 제거)
-country_name_map = (
-    df[['country','display_name']]
-    .drop_duplicates(subset='country')
-    .set_index('country')['display_name']
-    .to_dict()
-)
-
-pop['iso_code']     = pop.index.str.upper()
-pop['display_name'] = pop.index.map(country_name_map)
-
-### ▶ 인구증가량 Top 10
-top10 = pop.sort_values('change', ascending=False).head(10).reset_index()
-fig_inc = px.scatter_geo(
-    top10,
-    locations='iso_code',
-    size='change',
-    hover_name='display_name',
-    projection='natural earth',
-    title=f"{y1} → {y2} 인구증가량 Top 10"
-)
-fig_inc.update_traces(
-    hovertemplate="<b>%{hovertext}</b><br>증가량: %{marker.size:,}명"
-)
-st.plotly_chart(fig_inc, use_container_width=True)
-
-### ▶ 인구감소량 Top 10
-bottom10 = pop.sort_values('change', ascending=True).head(10).reset_index()
-bottom10['abs_change'] = bottom10['change'].abs()
-fig_dec = px.scatter_geo(
-    bottom10,
-    locations='iso_code',
-    size='abs_change',
-    hover_name='display_name',
-    projection='natural earth',
-    title=f"{y1} → {y2} 인구감소량 Top 10"
-)
-fig_dec.update_traces(
-    hovertemplate="<b>%{hovertext}</b><br>감소량: %{marker.size:,}명"
-)
-st.plotly_chart(fig_dec, use_container_width=True)
-
-### ▶ 인구증가율 Top 10
-top10_pct = pop.sort_values('pct_change', ascending=False).head(10).reset_index()
-fig_pct_inc = px.scatter_geo(
-    top10_pct,
-    locations='iso_code',
-    size='pct_change',
-    hover_name='display_name',
-    projection='natural earth',
-    title=f"{y1} → {y2} 인구증가율 Top 10 (%)"
-)
-fig_pct_inc.update_traces(
-    hovertemplate="<b>%{hovertext}</b><br>증가율: %{marker.size:.2f}%"
-)
-st.plotly_chart(fig_pct_inc, use_container_width=True)
-
-### ▶ 인구감소율 Top 10
-bottom10_pct = pop.sort_values('pct_change', ascending=True).head(10).reset_index()
-bottom10_pct['pct_decrease'] = bottom10_pct['pct_change'].abs()
-fig_pct_dec = px.scatter_geo(
-    bottom10_pct,
-    locations='iso_code',
-    size='pct_decrease',
-    hover_name='display_name',
-    projection='natural earth',
-    title=f"{y1} → {y2} 인구감소율 Top 10 (%)"
-)
-fig_pct_dec.update_traces(
-    hovertemplate="<b>%{hovertext}</b><br>감소율: %{marker.size:.2f}%"
-)
-st.plotly_chart(fig_pct_dec, use_container_width=True)
+# 페이지 뼈대를 먼저 그린 뒤 무거운 모듈을 불러옴 (콜드 스타트 단축)
+from common.startup import boot
+boot("06")
+
+import plotly.graph_objects as go
+
+from common.cube import load_cube
+from common.entities import load_entities
+from common.ranking import load_growth_engine
+from common.reactive import derived
+from common.render import show_cached_chart
+from common.tracing import debug_panel, span, trace_fragment
+
+with span("load", "cube"):
+    cube = load_cube()
+with span("load", "growth_engine"):
+    growth = load_growth_engine()
+
+# 국가 이름·ISO alpha-3 코드 (결과 행에만 적용)
+with span("load", "entities"):
+    entities = load_entities()
+
+def with_names(frame):
+    frame = frame.copy()
+    frame['iso3']         = frame['country'].map(entities['iso3'])
+    frame['display_name'] = frame['country'].map(entities['full_name'])
+    return frame
+
+# 지도별 설정: (랭킹 종류, 상위/하위, 제목, 툴팁 라벨, 툴팁 형식)
+MAPS = {
+    'inc':     ('change',     0, "인구증가량 Top 10",     "증가량", ":,",   "명"),
+    'dec':     ('change',     1, "인구감소량 Top 10",     "감소량", ":,",   "명"),
+    'pct_inc': ('pct_change', 0, "인구증가율 Top 10 (%)", "증가율", ":.2f", "%"),
+    'pct_dec': ('pct_change', 1, "인구감소율 Top 10 (%)", "감소율", ":.2f", "%"),
+}
+MAX_MARKER = 20
+
+def ranked_frames(y1, y2):
+    # 증감량·증감률 랭킹은 기간이 바뀔 때만 한 번 계산 (네 지도가 공유)
+    ranks = derived('06_ranks', (y1, y2), lambda: growth.rankings('pop', y1, y2, kinds=('change', 'pct_change'), k=10))
+    return {key: with_names(ranks[kind][end]) for key, (kind, end, *_) in MAPS.items()}
+
+def build_maps(y1, y2):
+    """네 랭킹을 trace 로 담은 지도 하나. 버튼으로 브라우저에서 전환합니다 (서버 재실행 없음)."""
+    frames = ranked_frames(y1, y2)
+    fig = go.Figure()
+    buttons = []
+    for i, (key, (kind, end, title, label, fmt, unit)) in enumerate(MAPS.items()):
+        frame = frames[key]
+        size = frame[kind].abs() if end else frame[kind]
+        fig.add_trace(go.Scattergeo(
+            locations=frame['iso3'],
+            hovertext=frame['display_name'],
+            marker=dict(size=size, sizemode='area', sizeref=2 * (size.max() if len(size) else 1) / MAX_MARKER ** 2),
+            hovertemplate=f"<b>%{{hovertext}}</b><br>{label}: %{{marker.size{fmt}}}{unit}<extra></extra>",
+            name=title,
+            visible=i == 0,
+        ))
+        buttons.append(dict(
+            label=label,
+            method='update',
+            args=[{'visible': [j == i for j in range(len(MAPS))]}, {'title.text': f"{y1} → {y2} {title}"}],
+        ))
+    first_title = next(iter(MAPS.values()))[2]
+    fig.update_layout(
+        title=f"{y1} → {y2} {first_title}",
+        geo=dict(projection_type='natural earth'),
+        showlegend=False,
+        updatemenus=[dict(type='buttons', direction='right', buttons=buttons, x=0, xanchor='left', y=1.08, yanchor='bottom')],
+        margin=dict(t=100),
+    )
+    return fig
+
+# 기간 변경 시 슬라이더와 지도 영역만 다시 실행 (st.fragment)
+@st.fragment
+@trace_fragment("06")
+def population_maps():
+    # 기간 선택
+    years = cube.years.tolist()
+    y1, y2 = st.select_slider("기간 선택", options=years, value=(years[0], years[-1]))
+
+    # 같은 기간의 지도는 세션 간 공유 캐시에서 재사용
+    show_cached_chart('06', {'y1': y1, 'y2': y2}, lambda: build_maps(y1, y2))
+
+    # ISO 코드가 없는 지역은 지도에 표시할 수 없으므로 이름을 따로 알림
+    unplaced = sorted({
+        name
+        for frame in ranked_frames(y1, y2).values()
+        for name in frame.loc[frame['iso3'].isna(), 'display_name'].dropna()
+    })
+    if unplaced:
+        st.caption(f"지도에 표시되지 않은 지역(ISO 코드 없음): {', '.join(unplaced)}")
+
+population_maps()
 
 with st.expander("🔍 사용 설명서"):
     st.write(
         "- 슬라이더에서 시작·종료 연도를 지정하세요.\n"
-        "- 순서대로: 인구 증가량 Top10, 인구 감소량 Top10,\n"
-        "  인구 증가율(%) Top10, 인구 감소율(%) Top10 지도를 확인할 수 있습니다.\n"
+        "- 지도 위 버튼으로 인구 증가량·감소량·증가율(%)·감소율(%) Top10 을\n"
+        "  바로 전환할 수 있습니다.\n"
         "- 마우스 호버 시 국가명과 수치가 툴팁에 표시됩니다."
     )
 
@@ -129,3 +118,5 @@ with st.expander("📚 교육적 함의 및 확장 활동"):
         "- 인구 변화량과 비율을 함께 분석하여 정책 우선순위 도출하기\n"
         "- 다양한 지표(예: 경제, 환경, 보건)와 연계한 종합 보고서 작성 실습"
     )
+
+debug_panel()
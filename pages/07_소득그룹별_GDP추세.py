@@ -1,27 +1,97 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 
 st.title("SDG 13: 소득그룹별 1인당 GDP 추세")
 st.write(
-    "소득그룹별 평균 1인당 GDP 변화를 선그래프로 비교합니다."
+    "소득그룹별 1인당 GDP 변화를 중앙값과 p10–p90 범위로 비교합니다. 평균과 인구 가중 평균으로도 바꿔 볼 수 있습니다."
 )
 st.markdown("---")
 
-@st.cache_data
-def load_data():
-    return pd.read_csv('data/merged_gapminder.csv')
+# 페이지 뼈대를 먼저 그린 뒤 무거운 모듈을 불러옴 (콜드 스타트 단축)
+from common.startup import boot
+boot("07")
 
-df = load_data()
-groups = df.groupby(['year','income_groups']).gdp_pcap.mean().reset_index()
-fig = px.line(
-    groups, x='year', y='gdp_pcap', color='income_groups',
-    labels={'gdp_pcap':'평균 1인당 GDP'}
-)
-st.plotly_chart(fig, use_container_width=True)
+import plotly.graph_objects as go
+from plotly.colors import DEFAULT_PLOTLY_COLORS
+
+from common.backend import get_backend
+from common.quantiles import INCOME_ORDER
+from common.render import show_cached_chart
+from common.tracing import debug_panel, span
+
+# 통계 전환 버튼: (라벨, 표시할 요약 컬럼, 밴드 표시 여부)
+STATS = [
+    ("중앙값 (p10–p90)", 'median', True),
+    ("평균",             'mean',   False),
+    ("인구 가중 평균",    'w_mean', False),
+]
+
+def build_trends(trends):
+    """그룹별 p10–p90 밴드와 통계별 선을 모두 담은 그림. 버튼으로 브라우저에서 전환합니다."""
+    groups = [g for g in INCOME_ORDER if g in set(trends['income_groups'])]
+    fig = go.Figure()
+    # 트레이스별 (통계 컬럼 또는 'band') — 버튼의 visible 목록 계산용
+    roles = []
+    for group, color in zip(groups, DEFAULT_PLOTLY_COLORS):
+        part = trends[trends['income_groups'] == group]
+        fill = color.replace('rgb', 'rgba').replace(')', ', 0.2)')
+        fig.add_trace(go.Scatter(
+            x=part['year'], y=part['p90'], mode='lines', line=dict(width=0, color=color),
+            legendgroup=group, showlegend=False, hoverinfo='skip',
+        ))
+        fig.add_trace(go.Scatter(
+            x=part['year'], y=part['p10'], mode='lines', line=dict(width=0, color=color),
+            fill='tonexty', fillcolor=fill, legendgroup=group, showlegend=False, hoverinfo='skip',
+        ))
+        roles += ['band', 'band']
+        for label, column, band in STATS:
+            hover = f"<b>{group}</b> %{{x}}<br>{label}: %{{y:,.0f}}"
+            extra = {}
+            if band:
+                # 밴드 값·국가 수는 밴드와 함께 보이는 중앙값 선에만 한 번 붙임 (그림 크기 절감)
+                extra['customdata'] = part[['p10', 'p90', 'n']]
+                hover += "<br>p10–p90: %{customdata[0]:,.0f} – %{customdata[1]:,.0f}<br>국가 수: %{customdata[2]}"
+            fig.add_trace(go.Scatter(
+                x=part['year'], y=part[column], mode='lines', line=dict(color=color),
+                name=group, legendgroup=group, visible=column == STATS[0][1],
+                hovertemplate=hover + "<extra></extra>",
+                **extra,
+            ))
+            roles.append(column)
+    buttons = [
+        dict(
+            label=label,
+            method='update',
+            args=[{'visible': [r == column or (band and r == 'band') for r in roles]},
+                  {'yaxis.title.text': f"1인당 GDP {label}"}],
+        )
+        for label, column, band in STATS
+    ]
+    fig.update_layout(
+        xaxis_title='year',
+        yaxis_title=f"1인당 GDP {STATS[0][0]}",
+        legend_title_text='income_groups',
+        updatemenus=[dict(type='buttons', direction='right', buttons=buttons, x=0, xanchor='left', y=1.02, yanchor='bottom')],
+        margin=dict(t=60),
+    )
+    return fig
+
+# 요약은 데이터셋 버전당 한 번 만든 (연도, 소득그룹) 표 (기본 pandas, GAPMINDER_BACKEND=duckdb 이면 Parquet 에 푸시다운)
+with span("load", "backend"):
+    backend = get_backend()
+
+def income_figure():
+    with span("aggregate", "income_trends"):
+        trends = backend.income_trends()
+    return build_trends(trends)
+
+# 통계 전환은 브라우저에서 처리하므로 그림은 백엔드별로 한 번만 만들어 재사용
+show_cached_chart('07', {'backend': backend.name}, income_figure)
 
 with st.expander("🔍 사용 설명서 설명 보기"):
-    st.write("- 범례 클릭으로 그룹 선택/비활성화.\n- 그래프 확대 기능 활용.")
+    st.write(
+        "- 그래프 위 버튼으로 중앙값(p10–p90 범위)·평균·인구 가중 평균을 전환.\n"
+        "- 범례 클릭으로 그룹 선택/비활성화.\n- 그래프 확대 기능 활용."
+    )
 
 with st.expander("💡 학생 토론 질문"):
     st.markdown(
@@ -34,3 +104,5 @@ with st.expander("📚 교육적 함의 및 확장 활동"):
         "- 경제적 불균형과 정책 대안 모색.\n"
         "- 국제 개발 협력 방안 토론."
     )
+
+debug_panel()
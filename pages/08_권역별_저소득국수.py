@@ -1,6 +1,4 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 
 st.title("SDG 1&10: 권역별 저소득 국가 수 변화")
 st.write(
@@ -8,19 +6,35 @@ st.write(
 )
 st.markdown("---")
 
-@st.cache_data
-def load_data():
-    return pd.read_csv('data/merged_gapminder.csv')
-
-df = load_data()
-threshold = st.number_input("저소득 기준 (USD)", value=1000)
-low = df[df.gdp_pcap < threshold]
-count = low.groupby(['year','world_4region']).country.nunique().reset_index(name='count')
-fig = px.area(
-    count, x='year', y='count', color='world_4region',
-    labels={'count':'국가 수'}
-)
-st.plotly_chart(fig, use_container_width=True)
+# 페이지 뼈대를 먼저 그린 뒤 무거운 모듈을 불러옴 (콜드 스타트 단축)
+from common.startup import boot
+boot("08")
+
+import plotly.express as px
+
+from common.backend import get_backend
+from common.render import show_chart
+from common.tracing import debug_panel, span, trace_fragment
+
+# 집계는 질의 백엔드에서 (기본 pandas, GAPMINDER_BACKEND=duckdb 이면 Parquet 에 푸시다운)
+with span("load", "backend"):
+    backend = get_backend()
+
+# 위젯 변경 시 이 영역만 다시 실행 (st.fragment)
+@st.fragment
+@trace_fragment("08")
+def low_income_by_region():
+    threshold = st.number_input("저소득 기준 (USD)", value=1000)
+    with span("aggregate", "count_by_region"):
+        count = backend.count_by_region(threshold)
+    with span("figure", "px.area"):
+        fig = px.area(
+            count, x='year', y='count', color='world_4region',
+            labels={'count':'국가 수'}
+        )
+    show_chart(fig, page='08')
+
+low_income_by_region()
 
 with st.expander("🔍 사용 설명서 설명 보기"):
     st.write("- 기준값을 변경하며 국가 수 변화를 살펴보세요.\n- 특정 권역 클릭으로 강조.")
@@ -36,3 +50,5 @@ with st.expander("📚 교육적 함의 및 확장 활동"):
         "- 지역 간 격차 분석.\n"
         "- 다자 개발 은행 역할 토론."
     )
+
+debug_panel()
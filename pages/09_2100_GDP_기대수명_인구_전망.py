@@ -1,6 +1,4 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 
 st.title("SDG 8: 국가별 GDP·기대수명·인구 비교 (기간 선택 가능)")
 st.write(
@@ -8,71 +6,40 @@ st.write(
 )
 st.markdown("---")
 
-@st.cache_data
-def load_data():
-    df_main = pd.read_csv('data/merged_gapminder.csv')
-    df_geo  = pd.read_csv(
-        'data/ddf--entities--geo--country.csv',
-        usecols=['country','name']
-    ).rename(columns={'name':'full_name'})
-    df = df_main.merge(df_geo, on='country', how='left')
-    # 이름 오버라이드
-    df['full_name'] = df['full_name'].replace({
-        'South Korea':       'Republic of Korea',
-        'USA':               'United States',
-        'UK':                'United Kingdom',
-    })
-    # 국기 이모지
-    flags = {
-        'United States':     '🇺🇸',
-        'China':             '🇨🇳',
-        'India':             '🇮🇳',
-        'Japan':             '🇯🇵',
-        'Germany':           '🇩🇪',
-        'United Kingdom':    '🇬🇧',
-        'Republic of Korea': '🇰🇷',
-        'France':            '🇫🇷',
-        'Brazil':            '🇧🇷',
-        'Canada':            '🇨🇦',
-        'Australia':         '🇦🇺'
+# 페이지 뼈대를 먼저 그린 뒤 무거운 모듈을 불러옴 (콜드 스타트 단축)
+from common.startup import boot
+boot("09")
+
+import plotly.express as px
+
+from common.entities import load_country_index, load_entities
+from common.reactive import derived
+from common.render import show_cached_chart
+from common.tracing import debug_panel, span, trace_fragment
+
+# 주요국 (사이드바 상단에 국기와 함께 표시)
+major_codes = ['usa', 'chn', 'ind', 'jpn', 'deu', 'gbr', 'kor', 'fra', 'bra', 'can', 'aus']
+
+@st.cache_resource
+def load_display_names():
+    """country 코드 → 표시명 (주요국은 국기 포함, 국가 수만큼만 계산)."""
+    entities = load_entities()
+    return {
+        c: f"{row.flag} {row.full_name}" if c in major_codes else row.full_name
+        for c, row in entities.iterrows()
     }
-    df['display_name'] = df['full_name'].apply(
-        lambda n: f"{flags[n]} {n}" if n in flags else n
-    )
-    return df
 
 # 데이터 로드
-df = load_data()
-min_year, max_year = int(df['year'].min()), int(df['year'].max())
-
-# 사이드바: 기간 선택
-st.sidebar.markdown("### ⏳ 기간 선택")
-year_start, year_end = st.sidebar.slider(
-    "비교할 연도 범위",
-    min_value=min_year,
-    max_value=max_year,
-    value=(min_year, max_year),
-    step=1
-)
+with span("load", "country_index"):
+    facts = load_country_index()
+with span("load", "display_names"):
+    display_names = load_display_names()
+codes_by_name = {n: c for c, n in display_names.items()}
+min_year, max_year = int(facts.years.min()), int(facts.years.max())
 
 # 사이드바: 국가 다중 선택
-major = [
-    f"{emoji} {name}" for name, emoji in [
-        ("United States", "🇺🇸"),
-        ("China", "🇨🇳"),
-        ("India", "🇮🇳"),
-        ("Japan", "🇯🇵"),
-        ("Germany", "🇩🇪"),
-        ("United Kingdom", "🇬🇧"),
-        ("Republic of Korea", "🇰🇷"),
-        ("France", "🇫🇷"),
-        ("Brazil", "🇧🇷"),
-        ("Canada", "🇨🇦"),
-        ("Australia", "🇦🇺")
-    ]
-]
-all_countries = sorted(df['display_name'].unique())
-others = [c for c in all_countries if c not in major]
+major = [display_names[c] for c in major_codes]
+others = sorted(n for c, n in display_names.items() if c not in major_codes)
 options = major + others
 
 st.sidebar.markdown("### 🌍 국가 선택")
@@ -86,41 +53,60 @@ if not selected:
     st.sidebar.warning("하나 이상의 국가를 선택해야 합니다.")
     st.stop()
 
-# 필터링: 국가 + 연도 범위
-df_sel = df[
-    (df['display_name'].isin(selected)) &
-    (df['year'] >= year_start) &
-    (df['year'] <= year_end)
-]
-
-# 1인당 GDP 그래프
-fig_gdp = px.line(
-    df_sel, x='year', y='gdp_pcap', color='display_name',
-    labels={'gdp_pcap':'1인당 GDP (USD)', 'year':'연도', 'display_name':'국가'},
-    title=f"1인당 GDP ({year_start}–{year_end}) 비교"
-)
-st.plotly_chart(fig_gdp, use_container_width=True)
+# 지표별 선그래프: (축 라벨, 제목)
+CHARTS = {
+    'gdp_pcap': ('1인당 GDP (USD)', '1인당 GDP'),
+    'lex':      ('기대수명 (년)',   '기대수명'),
+    'pop':      ('인구 수',         '인구 수'),
+}
 
-# 기대수명 그래프
-fig_lex = px.line(
-    df_sel, x='year', y='lex', color='display_name',
-    labels={'lex':'기대수명 (년)', 'year':'연도', 'display_name':'국가'},
-    title=f"기대수명 ({year_start}–{year_end}) 비교"
-)
-st.plotly_chart(fig_lex, use_container_width=True)
+def selected_rows(codes, year_start, year_end):
+    """국가별 연속 구간에서 연도 범위만 잘라냄 (표시명은 선택된 행에만 매핑)."""
+    df_sel = facts.select(codes, year_start, year_end)
+    return df_sel.assign(
+        display_name=df_sel['country'].astype(str).map(display_names)
+    )
 
-# 인구 수 그래프
-fig_pop = px.line(
-    df_sel, x='year', y='pop', color='display_name',
-    labels={'pop':'인구 수', 'year':'연도', 'display_name':'국가'},
-    title=f"인구 수 ({year_start}–{year_end}) 비교"
-)
-st.plotly_chart(fig_pop, use_container_width=True)
+def build_line(metric, rows, year_start, year_end):
+    label, title = CHARTS[metric]
+    return px.line(
+        rows(), x='year', y=metric, color='display_name',
+        labels={metric: label, 'year':'연도', 'display_name':'국가'},
+        title=f"{title} ({year_start}–{year_end}) 비교",
+        render_mode='svg',
+    )
+
+# 기간 변경 시 사이드바·국가 목록은 그대로 두고 그래프 영역만 다시 실행 (st.fragment)
+@st.fragment
+@trace_fragment("09")
+def comparison_charts(codes):
+    # 기간 선택
+    year_start, year_end = st.slider(
+        "⏳ 비교할 연도 범위",
+        min_value=min_year,
+        max_value=max_year,
+        value=(min_year, max_year),
+        step=1
+    )
+    full_fidelity = st.checkbox("원본 해상도로 그리기 (다운샘플링·WebGL 전환 안 함)", value=False)
+    state = {'countries': codes, 'start': year_start, 'end': year_end}
+
+    def rows():
+        # 선택 행은 국가·기간이 바뀔 때만 다시 잘라내고 세 그래프가 공유
+        return derived('09_rows', state, lambda: selected_rows(codes, year_start, year_end))
+
+    # 같은 국가·기간 조합의 그래프는 세션 간 공유 캐시에서 재사용
+    for metric in CHARTS:
+        show_cached_chart('09', {**state, 'metric': metric},
+                          lambda: build_line(metric, rows, year_start, year_end),
+                          full_fidelity=full_fidelity or None)
+
+comparison_charts([codes_by_name[n] for n in selected])
 
 with st.expander("🔍 사용 설명서"):
     st.write(
-        f"- 사이드바에서 연도 범위를 {year_start}년부터 {year_end}년으로 설정할 수 있습니다.\n"
-        "- 다중 선택으로 비교하고 싶은 국가를 지정하세요."
+        "- 그래프 위 슬라이더로 비교할 연도 범위를 설정할 수 있습니다. (그래프 영역만 다시 그려집니다)\n"
+        "- 사이드바의 다중 선택으로 비교하고 싶은 국가를 지정하세요."
     )
 
 with st.expander("💡 토론 질문"):
@@ -128,3 +114,5 @@ with st.expander("💡 토론 질문"):
         "1. 선택한 기간 동안 국가 간 성장 추세 차이는 무엇이 원인일까요?\n"
         "2. 인구 변화가 GDP·기대수명에 미친 영향을 분석해 보세요."
     )
+
+debug_panel()
@@ -0,0 +1,12 @@
+"""테스트 공통 설정: 저장소 루트를 import 경로에 두고 백그라운드 워밍업을 끕니다."""
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("GAPMINDER_WARMUP", "0")
+
+
+def page_path(prefix):
+    return str(next((ROOT / "pages").glob(f"{prefix}*.py")))
@@ -0,0 +1,62 @@
+"""로컬 API 서버를 띄워 잘못된 매개변수에 대한 상태 코드와 JSON 본문을 확인하는 테스트."""
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from common.api import make_server
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server = make_server("127.0.0.1", 0, quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def get(url):
+    """(상태 코드, JSON 으로 읽은 본문). 본문이 올바른 JSON 이 아니면 실패합니다."""
+    try:
+        with urllib.request.urlopen(url) as resp:
+            status, body = resp.status, resp.read()
+    except urllib.error.HTTPError as e:
+        status, body = e.code, e.read()
+
+    def reject(constant):
+        raise ValueError(f"JSON 이 아닌 값: {constant}")
+
+    return status, json.loads(body, parse_constant=reject)
+
+
+@pytest.mark.parametrize("query", [
+    "low_income_share?threshold=nan",
+    "low_income_share?threshold=inf",
+    "low_income_share?threshold=abc",
+    "yearly_mean?weighted=maybe",
+    "window_mean?metric=pop",
+    "growth_top?k=0",
+    "growth_top?y1=2020&y2=2000",
+    "income_trend?start=1500",
+])
+def test_bad_parameters_return_400_json(base_url, query):
+    status, body = get(f"{base_url}/v1/query/{query}")
+    assert status == 400
+    assert "error" in body
+
+
+@pytest.mark.parametrize("value, expected", [("true", True), ("0", False)])
+def test_bool_parameter(base_url, value, expected):
+    status, body = get(f"{base_url}/v1/query/yearly_mean?weighted={value}&start=2000&end=2000")
+    assert status == 200
+    assert body["params"]["weighted"] is expected
+
+
+def test_unknown_path_returns_404_json(base_url):
+    status, body = get(f"{base_url}/v1/nope")
+    assert status == 404
+    assert "error" in body
@@ -0,0 +1,76 @@
+"""캐시가 하나도 없는 임시 트리에서 DDF 원본 → 병합 CSV·캐시·인덱스 번들 빌드 테스트."""
+import shutil
+
+import pandas as pd
+import pytest
+import streamlit as st
+
+from common import build, cache, data, shared
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    """저장소의 병합 CSV 를 DDF 원본으로 풀어 둔 임시 data 디렉터리 (캐시 없음)."""
+    data_dir = tmp_path / "data"
+    ddf = data_dir / "ddf"
+    ddf.mkdir(parents=True)
+    merged = pd.read_csv(data.MERGED_CSV)
+    for indicator, key in (("gdp_pcap", "geo"), ("lex", "geo"), ("pop", "country")):
+        rows = merged[["country", "year", indicator]].dropna()
+        rows.columns = [key, "time", indicator]
+        rows.to_csv(ddf / f"ddf--datapoints--{indicator}--by--{key}--time.csv", index=False)
+    geo_csv = data_dir / data.GEO_CSV.name
+    shutil.copy(data.GEO_CSV, geo_csv)
+    merged_csv = data_dir / data.MERGED_CSV.name
+    cache_dir = data_dir / "cache"
+
+    sources = {merged_csv: data.SOURCES[data.MERGED_CSV], geo_csv: data.SOURCES[data.GEO_CSV]}
+    monkeypatch.setattr(data, "SOURCES", sources)
+    monkeypatch.setattr(data, "MERGED_CSV", merged_csv)
+    monkeypatch.setattr(data, "GEO_CSV", geo_csv)
+    monkeypatch.setattr(cache, "CACHE_DIR", cache_dir)
+    monkeypatch.setattr(shared, "CACHE_DIR", cache_dir)
+    monkeypatch.setattr(shared, "SHARED_DIR", cache_dir / "shared")
+    monkeypatch.setattr(build, "MERGED_CSV", merged_csv)
+    monkeypatch.setattr(build, "BUILD_DIR", cache_dir / "build")
+    monkeypatch.setattr(build, "STATE_FILE", cache_dir / "build" / "state.json")
+    # 파생 객체 로더가 임시 트리의 데이터로 다시 계산하도록 캐시를 비움
+    st.cache_resource.clear()
+    yield {"ddf": ddf, "geo": geo_csv, "output": merged_csv}
+    st.cache_resource.clear()
+
+
+def run_build(tree):
+    return build.build(tree["ddf"], tree["geo"], tree["output"])
+
+
+def bundle_exists():
+    token = shared.bundle_token()
+    return token is not None and (shared.SHARED_DIR / token / shared.BUNDLE_FILE).exists()
+
+
+def test_build_on_clean_tree_publishes_bundle(tree):
+    summary = run_build(tree)
+    assert summary["rows"] > 0
+    assert summary["published"]
+    assert all(cache.is_fresh(src, schema) for src, (_, schema) in data.SOURCES.items())
+    assert bundle_exists()
+
+    again = run_build(tree)
+    assert again["rows"] is None and not again["published"]
+
+
+def test_failed_publish_resumes_without_merging(tree, monkeypatch):
+    def fail(objects, token=None):
+        raise RuntimeError("publish failed")
+
+    with monkeypatch.context() as m:
+        m.setattr(shared, "publish", fail)
+        with pytest.raises(RuntimeError):
+            run_build(tree)
+    assert not bundle_exists()
+
+    summary = run_build(tree)
+    assert summary["rows"] is None
+    assert summary["published"]
+    assert bundle_exists()
@@ -0,0 +1,18 @@
+"""페이지 스크립트를 AppTest 로 헤드리스 실행하는 회귀 테스트."""
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from conftest import page_path
+
+
+def run_page(prefix):
+    return AppTest.from_file(page_path(prefix), default_timeout=120).run()
+
+
+@pytest.mark.parametrize("fit", ["최소제곱(OLS)", "인구 가중 OLS"])
+def test_05_single_year_with_fit(fit):
+    at = run_page("05")
+    at.radio[0].set_value(fit).run()
+    at.slider[0].set_value((2000, 2000)).run()
+    assert not at.exception
+    assert len(at.get("plotly_chart")) == 2
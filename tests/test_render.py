@@ -0,0 +1,50 @@
+"""common.render 의 WebGL 전환·다운샘플링 규칙 테스트."""
+import numpy as np
+import plotly.graph_objects as go
+
+from common.render import optimize_figure
+
+HOVER = "%{x}<br>year=%{customdata[0]}<br>y=%{y}<extra></extra>"
+
+
+def scatter(n, **kwargs):
+    return go.Scatter(x=np.arange(n), y=np.arange(n), mode="markers", **kwargs)
+
+
+def test_unchanged_figure_is_not_copied():
+    fig = go.Figure(scatter(10))
+    out, report = optimize_figure(fig, webgl_threshold=100)
+    assert out is fig
+    assert report["backend"] == "svg"
+
+
+def test_webgl_keeps_customdata_by_default():
+    fig = go.Figure(scatter(200, customdata=np.arange(200)[:, None], hovertemplate=HOVER))
+    out, report = optimize_figure(fig, webgl_threshold=100)
+    assert report["backend"] == "webgl"
+    assert out.data[0].type == "scattergl"
+    assert out.data[0].customdata is not None
+    assert out.data[0].hovertemplate == HOVER
+
+
+def test_webgl_drops_only_customdata_tokens():
+    fig = go.Figure(scatter(200, customdata=np.arange(200)[:, None], hovertemplate=HOVER))
+    out, _ = optimize_figure(fig, webgl_threshold=100, drop_customdata=True)
+    assert out.data[0].customdata is None
+    assert out.data[0].hovertemplate == "%{x}<br>y=%{y}<extra></extra>"
+    # 입력 그림은 그대로
+    assert fig.data[0].customdata is not None
+
+
+def test_offsetgroup_trace_stays_svg():
+    fig = go.Figure([scatter(200), scatter(200, offsetgroup="a")])
+    out, _ = optimize_figure(fig, webgl_threshold=100)
+    assert [t.type for t in out.data] == ["scattergl", "scatter"]
+
+
+def test_tonexty_band_keeps_both_traces_on_svg():
+    upper = scatter(200, line_width=0)
+    lower = scatter(200, fill="tonexty")
+    fig = go.Figure([upper, lower, scatter(200)])
+    out, _ = optimize_figure(fig, webgl_threshold=100)
+    assert [t.type for t in out.data] == ["scatter", "scatter", "scattergl"]